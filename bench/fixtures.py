@@ -0,0 +1,128 @@
+# 벤치마크/부하 테스트용 오프라인 픽스처
+# - 네트워크 소스(fdr.DataReader, KIND 명단, OpenDartReader, Google News RSS)를 로컬 스텁으로 대체
+# - 합성 OHLCV는 main.py 인트로 데모와 같은 방식(np.cumsum(np.random.randn(n)))으로 생성
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# stockflow.config가 import 시점에 DATA_DIR을 읽으므로 가장 먼저 임시 디렉터리로 지정
+os.environ.setdefault("STOCKFLOW_DATA_DIR", tempfile.mkdtemp(prefix="stockflow-bench-"))
+os.environ.setdefault("DART_API_KEY", "offline")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def synthetic_ohlcv(n: int, start=None, end=None, seed: int | None = 0) -> pd.DataFrame:
+    # 영업일 기준으로 10만 봉은 pandas 날짜 범위를 넘으므로 긴 시계열은 달력일 사용
+    freq = "B" if n <= 50_000 else "D"
+    if start is not None:
+        idx = pd.date_range(start=start, periods=n, freq=freq, name="Date")
+    else:
+        end = pd.Timestamp.today().normalize() if end is None else pd.Timestamp(end)
+        idx = pd.date_range(end=end, periods=n, freq=freq, name="Date")
+
+    # 행 단위로 난수를 뽑아 같은 seed면 길이가 달라도 앞부분 시세가 동일
+    noise = np.random.default_rng(seed).standard_normal((n, 5))
+    base = 10000 + np.cumsum(noise[:, 0] * 80)
+    close = np.maximum(base, 100).round()
+    open_ = (np.concatenate(([close[0]], close[:-1])) + noise[:, 1] * 30).round()
+    high = np.maximum(open_, close) + np.abs(noise[:, 2] * 50)
+    low = np.minimum(open_, close) - np.abs(noise[:, 3] * 50)
+    volume = (1_000_000 + np.abs(noise[:, 4]) * 1_000_000).astype(np.int64)
+
+    return pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume,
+         "Change": np.concatenate(([0.0], close[1:] / close[:-1] - 1))},
+        index=idx,
+    )
+
+
+def synthetic_listing(n: int = 2500) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    syllables = list("가나다라마바사아자차카타파하삼성현대엘지에스케이전자화학바이오제약금융증권")
+    names = {"삼성전자", "SK하이닉스", "LG전자", "현대차", "NAVER", "카카오"}
+    while len(names) < n:
+        names.add("".join(rng.choice(syllables, rng.integers(2, 7))))
+    names = sorted(names)
+    return pd.DataFrame({"회사명": names, "종목코드": [f"{i:06}" for i in range(1, len(names) + 1)]})
+
+
+FAKE_HISTORY_START = pd.Timestamp("2000-01-03")
+
+
+def _fake_reader(code, start=None, end=None, *args, **kwargs) -> pd.DataFrame:
+    start = pd.Timestamp(start) if start else FAKE_HISTORY_START
+    end = pd.Timestamp(end) if end else pd.Timestamp.today().normalize()
+    if end < FAKE_HISTORY_START:
+        return synthetic_ohlcv(0)
+    # 종목코드마다 다른 (재현 가능한) 시세, 요청 구간만 잘라서 반환
+    seed = sum(map(ord, str(code)))
+    n = len(pd.bdate_range(FAKE_HISTORY_START, end))
+    full = synthetic_ohlcv(n, start=FAKE_HISTORY_START, seed=seed)
+    return full.loc[start:end]
+
+
+class FakeOpenDartReader:
+    def __init__(self, api_key):
+        listing = synthetic_listing()
+        self.corp_codes = pd.DataFrame({
+            "corp_code": [f"{i:08}" for i in range(len(listing))],
+            "corp_name": listing["회사명"],
+            "stock_code": listing["종목코드"],
+            "modify_date": "20240101",
+        })
+
+    def finstate(self, corp, bsns_year, reprt_code="11011"):
+        accounts = ["매출액", "영업이익", "법인세차감전 순이익", "당기순이익", "자산총계", "부채총계", "자본총계"]
+        rows = []
+        for fs_div, fs_nm in (("CFS", "연결재무제표"), ("OFS", "재무제표")):
+            for i, account in enumerate(accounts):
+                amount = (i + 1) * 1_000_000_000 + int(bsns_year)
+                rows.append({
+                    "rcept_no": f"{bsns_year}0301000000", "reprt_code": reprt_code, "bsns_year": str(bsns_year),
+                    "corp_code": corp, "stock_code": "", "fs_div": fs_div, "fs_nm": fs_nm,
+                    "sj_div": "BS" if i >= 4 else "IS", "sj_nm": "재무상태표" if i >= 4 else "손익계산서",
+                    "account_nm": account, "thstrm_nm": f"제 {bsns_year} 기",
+                    "thstrm_amount": f"{amount:,}", "frmtrm_amount": f"{amount - 1000:,}",
+                    "bfefrmtrm_amount": f"{amount - 2000:,}", "ord": str(i), "currency": "KRW",
+                })
+        return pd.DataFrame(rows)
+
+    def report(self, corp, key_word, bsns_year, reprt_code="11011"):
+        return pd.DataFrame({"se": ["합계"], "istc_totqy": ["100,000,000"]})
+
+
+def rss_text(query: str, n: int = 50) -> str:
+    items = "".join(
+        f"<item><title>{query} 관련 뉴스 {i}</title><link>https://example.com/{i}</link>"
+        f"<pubDate>Mon, 01 Jan 2024 00:00:{i % 60:02d} GMT</pubDate></item>"
+        for i in range(n)
+    )
+    return f"<?xml version='1.0'?><rss version='2.0'><channel><title>{query}</title>{items}</channel></rss>"
+
+
+class _FakeResponse:
+    def __init__(self, query: str):
+        self.status_code = 200
+        self.headers = {"ETag": f'"{query}"'}
+        self.text = rss_text(query)
+
+    def raise_for_status(self):
+        pass
+
+
+# 네트워크 소스를 모두 로컬 스텁으로 교체
+def install_stubs() -> None:
+    import FinanceDataReader as fdr
+
+    from stockflow import company, news
+
+    fdr.DataReader = _fake_reader
+    company._scrape_listing = synthetic_listing
+    sys.modules["OpenDartReader"] = FakeOpenDartReader
+    news._session.get = lambda url, params=None, **kwargs: _FakeResponse((params or {}).get("q", ""))
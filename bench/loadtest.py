@@ -0,0 +1,198 @@
+# 동시 세션 부하 테스트 (Streamlit AppTest로 실제 스크립트를 N개 세션이 동시에 실행)
+#
+#   python -m bench.loadtest                          # 1/4/16 세션
+#   python -m bench.loadtest --sessions 8 32 --rounds 2
+#   python -m bench.loadtest --json loadtest.json     # 결과를 JSON으로도 저장
+#
+# 세션 하나의 시나리오: 메인 로드 → 회사명 입력 → 조회하기 → 차트 종류 변경 → 부가지표 페이지 → 재무제표&뉴스 페이지
+# 네트워크 소스는 모두 bench.fixtures 스텁을 쓰고, 캐시는 세션 수 단계마다 비우지 않는다(서버에서처럼 누적)
+import argparse
+import contextlib
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 부하 테스트 중에는 rerun마다 JSONL을 쓰지 않는다 (perf import 전에 지정)
+os.environ.setdefault("STOCKFLOW_PERF_LOG", "off")
+
+from bench import fixtures  # noqa: E402,F401  (데이터 디렉터리/경로 설정을 먼저 적용)
+
+import numpy as np  # noqa: E402
+from streamlit.runtime import Runtime  # noqa: E402
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager  # noqa: E402
+from streamlit.runtime.media_file_manager import MediaFileManager  # noqa: E402
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit import config  # noqa: E402
+from streamlit import logger as streamlit_logger  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1 import app_test  # noqa: E402
+from streamlit.testing.v1 import local_script_runner  # noqa: E402
+from streamlit.testing.v1.util import build_mock_config_get_option  # noqa: E402
+
+from stockflow import perf  # noqa: E402
+
+ROOT = Path(fixtures.ROOT)
+MAIN_SCRIPT = str(ROOT / "main.py")
+PAGES = ["pages/1주가_데이터분석.py", "pages/2재무재표&뉴스.py"]
+DEFAULT_SESSIONS = [1, 4, 16]
+TIMEOUT = 120
+# 캐시 적중률을 보고할 카운터 그룹 (<그룹>.hit/.miss 또는 <그룹>.call/.miss 규칙을 따르는 것만)
+HIT_GROUPS = ["datasets", "indicators", "projection", "company.listing", "dart.corp_codes",
+              "dart.finstate", "facts", "news"]
+
+
+class SessionFailed(Exception):
+    pass
+
+
+def _check(at: AppTest, step: str) -> None:
+    if at.exception:
+        raise SessionFailed(f"{step}: {at.exception[0].message}")
+
+
+# 스크립트가 예외 없이 멈춘 경우에도 위젯이 없으면 IndexError 대신 단계 이름과 함께 실패
+def _first(widgets, step: str, kind: str):
+    if not len(widgets):
+        raise SessionFailed(f"{step}: {kind} 위젯이 없습니다")
+    return widgets[0]
+
+
+# AppTest는 실행마다 가짜 Runtime을 새로 만들고 끝나면 지워서 동시 세션이 서로의 Runtime을 없애고
+# st.cache_data 저장소도 세션마다 따로 생긴다 → 서버처럼 프로세스 하나에 Runtime 하나를 공유하도록 고정
+# 실행마다 config.get_option을 패치/복원하는 것도 스레드 간에 순서가 꼬이므로 한 번만 적용
+# 스크립트 바이트코드 캐시도 실행마다 새로 만들어 여러 스레드가 같은 스크립트를 동시에 컴파일하다
+# ast.parse가 SystemError를 내므로, 하나를 공유하고 세션 시작 전에 모든 페이지를 미리 컴파일해 둔다
+def _install_shared_runtime() -> None:
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: shared)
+    Runtime.exists = classmethod(lambda cls: True)
+    config.get_option = build_mock_config_get_option({"global.appTest": True, "logger.level": "error"})
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+
+    script_cache = ScriptCache()
+    for script in [MAIN_SCRIPT, *(str(ROOT / page) for page in PAGES)]:
+        script_cache.get_bytecode(script)
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+
+
+# 세션 하나를 시나리오대로 실행하고 rerun별 소요 시간(초) 목록을 반환
+def run_session(company_name: str) -> list[tuple[str, float]]:
+    timings = []
+
+    def step(name: str, action):
+        started = time.perf_counter()
+        result = action()
+        timings.append((name, time.perf_counter() - started))
+        _check(result, name)
+        return result
+
+    at = AppTest.from_file(MAIN_SCRIPT, default_timeout=TIMEOUT)
+    step("main.load", at.run)
+    step("main.input", lambda: _first(at.sidebar.text_input, "main.input", "text_input").input(company_name).run())
+    step("main.lookup", lambda: _first(at.sidebar.button, "main.lookup", "button").click().run())
+    if len(at.radio):
+        step("main.chart_toggle", lambda: at.radio[0].set_value("Line").run())
+    for page in PAGES:
+        step(f"page:{Path(page).stem}", lambda page=page: at.switch_page(page).run())
+    return timings
+
+
+def _percentile(values: list[float], q: float) -> float:
+    return float(np.percentile(values, q)) * 1000 if values else float("nan")
+
+
+def _hit_rates(before: dict[str, int], after: dict[str, int]) -> dict[str, float | None]:
+    delta = {k: after.get(k, 0) - before.get(k, 0) for k in after}
+    rates = {}
+    for group in HIT_GROUPS:
+        misses = delta.get(f"{group}.miss", 0)
+        # st.cache_data로 감싼 계산은 miss만 본문에서 세므로 hit = call - miss
+        hits = delta.get(f"{group}.hit", max(delta.get(f"{group}.call", 0) - misses, 0))
+        rates[group] = round(hits / (hits + misses) * 100, 1) if hits + misses else None
+    return rates
+
+
+def run_level(n_sessions: int, rounds: int, names: list[str]) -> dict:
+    before = perf.counters()
+    tracemalloc.reset_peak()
+    timings: list[tuple[str, float]] = []
+    failures: list[str] = []
+    lock = threading.Lock()
+
+    def worker(i: int):
+        for r in range(rounds):
+            try:
+                result = run_session(names[(i + r) % len(names)])
+            except Exception as e:
+                with lock:
+                    failures.append(f"session {i}: {e}")
+                return
+            with lock:
+                timings.extend(result)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_sessions, thread_name_prefix="loadtest") as pool:
+        list(pool.map(worker, range(n_sessions)))
+    wall = time.perf_counter() - started
+
+    latencies = [t for _, t in timings]
+    by_step = {}
+    for name, t in timings:
+        by_step.setdefault(name, []).append(t)
+    return {
+        "sessions": n_sessions,
+        "reruns": len(latencies),
+        "wall_s": round(wall, 2),
+        "p50_ms": round(_percentile(latencies, 50), 1),
+        "p95_ms": round(_percentile(latencies, 95), 1),
+        "p99_ms": round(_percentile(latencies, 99), 1),
+        "peak_mb": round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1),
+        "steps_p50_ms": {name: round(statistics.median(ts) * 1000, 1) for name, ts in by_step.items()},
+        "hit_rate": _hit_rates(before, perf.counters()),
+        "failures": failures,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="StockFlow 동시 세션 부하 테스트")
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_SESSIONS)
+    parser.add_argument("--rounds", type=int, default=1, help="세션마다 시나리오 반복 횟수")
+    parser.add_argument("--companies", nargs="+", default=["삼성전자", "SK하이닉스", "LG전자", "현대차", "NAVER", "카카오"])
+    parser.add_argument("--json", type=Path, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    fixtures.install_stubs()
+    _install_shared_runtime()
+    # 세션마다 반복되는 사용 중단/ScriptRunContext 경고가 결과 표를 가리지 않도록 (설정을 다시 읽을 때도 유지)
+    streamlit_logger.set_log_level(logging.ERROR)
+    tracemalloc.start()
+
+    results = []
+    print(f"{'sessions':>8}{'reruns':>8}{'wall(s)':>9}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'peak(MB)':>10}  cache hit %")
+    for n in args.sessions:
+        level = run_level(n, args.rounds, args.companies)
+        results.append(level)
+        hits = ", ".join(f"{k}={v:.0f}" for k, v in level["hit_rate"].items() if v is not None)
+        print(f"{n:>8}{level['reruns']:>8}{level['wall_s']:>9.2f}{level['p50_ms']:>10.1f}{level['p95_ms']:>10.1f}"
+              f"{level['p99_ms']:>10.1f}{level['peak_mb']:>10.1f}  {hits}")
+        for failure in level["failures"][:5]:
+            print(f"  실패 - {failure}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+        print(f"\n결과 저장: {args.json}")
+    return 1 if any(level["failures"] for level in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
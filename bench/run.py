@@ -0,0 +1,179 @@
+# 오프라인 벤치마크 (네트워크 없이 합성 데이터로 계산/렌더링 경로 측정)
+#
+#   python -m bench.run                       # 1k/10k/100k 봉 측정 후 기준값과 비교
+#   python -m bench.run --save-baseline       # 현재 결과를 bench/baseline.json에 저장
+#   python -m bench.run --sizes 1000 --cases metrics figure_candle
+#
+# 기준값보다 threshold(기본 20%) 이상 느려진 항목이 있으면 종료 코드 1
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from bench import fixtures  # 데이터 디렉터리/경로 설정을 다른 stockflow import보다 먼저 적용
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from stockflow import charting, company, export, indicators, projection, risk
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+CASES = {}
+
+
+def case(name: str):
+    def register(fn):
+        CASES[name] = fn
+        return fn
+    return register
+
+
+# 각 케이스는 (봉 개수 n, 합성 OHLCV) → 측정할 인자 없는 함수를 반환
+@case("metrics")
+def _metrics(n, df):
+    return lambda: indicators.compute(df["Close"])
+
+
+@case("ma_cross")
+def _ma_cross(n, df):
+    close = df["Close"].to_numpy()
+
+    def run():
+        _, partial = indicators.moving_averages(close)
+        return indicators.cross_points(partial[5], partial[20])
+    return run
+
+
+# 몬테카를로 전망 (2만 경로 × 60거래일, 히스토리 길이는 재표본 대상 크기에만 영향)
+@case("projection")
+def _projection(n, df):
+    return lambda: projection.simulate(df["Close"], 60, "bootstrap")
+
+
+# 롤링 위험 지표 (창 4개 × 최대낙폭/변동성/베타/상관, 지수는 다른 시드의 합성 시세)
+@case("rolling_risk")
+def _rolling_risk(n, df):
+    bench = fixtures.synthetic_ohlcv(n, seed=7)["Close"]
+    bench.index = df.index
+    return lambda: risk.compute(df["Close"], bench)
+
+
+def _price_figure(df, chart_type):
+    fig = make_subplots(rows=1, cols=1, shared_xaxes=True)
+    if chart_type == "Candle_Stick":
+        chart_df, _ = charting.auto_resample(df)
+        fig.add_trace(go.Candlestick(
+            x=chart_df.index, open=chart_df["Open"], high=chart_df["High"],
+            low=chart_df["Low"], close=chart_df["Close"], name="Price",
+        ))
+        fig.update_layout(xaxis_rangeslider_visible=False)
+    else:
+        line = charting.downsample_line(df["Close"])
+        fig.add_trace(go.Scattergl(x=line.index, y=line, mode="lines", name="Close"))
+    fig.add_annotation(x=df["Low"].idxmin(), y=df["Low"].min(), text="최저가", showarrow=True)
+    fig.add_annotation(x=df["High"].idxmax(), y=df["High"].max(), text="최고가", showarrow=True)
+    # 브라우저로 보내는 JSON 직렬화까지 포함해서 측정
+    return fig.to_json()
+
+
+@case("figure_candle")
+def _figure_candle(n, df):
+    return lambda: _price_figure(df, "Candle_Stick")
+
+
+@case("figure_line")
+def _figure_line(n, df):
+    return lambda: _price_figure(df, "Line")
+
+
+def _export_case(fmt):
+    def setup(n, df):
+        export_df = df.assign(**{f"MA{w}": v for w, v in indicators.compute(df["Close"]).ma.items()})
+        return lambda: export._BUILDERS[fmt](export_df)
+    return setup
+
+
+case("export_xlsx")(_export_case("엑셀(xlsx)"))
+case("export_xlsx_streaming")(_export_case("엑셀(xlsx, 대용량)"))
+case("export_csv")(_export_case("CSV"))
+case("export_parquet")(_export_case("Parquet"))
+
+
+# 회사 검색은 봉 개수와 무관: n개 질의를 상장사 2,500개 인덱스에 대해 수행
+@case("company_lookup")
+def _company_lookup(n, df):
+    listing = fixtures.synthetic_listing()
+    index = company.CompanyIndex(listing)
+    rng = np.random.default_rng(0)
+    names = listing["회사명"].to_numpy()
+    queries = [names[i][: rng.integers(1, len(names[i]) + 1)] for i in rng.integers(0, len(names), min(n, 10_000))]
+
+    def run():
+        for q in queries:
+            if index.lookup(q) is None:
+                index.suggest(q)
+    return run
+
+
+def measure(fn, repeat: int) -> tuple[float, object]:
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="StockFlow 오프라인 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.2, help="허용 성능 저하 비율 (0.2 = 20%%)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    fixtures.install_stubs()
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    results: dict[str, float] = {}
+    regressions = []
+
+    print(f"{'case':<24}{'bars':>9}{'median(ms)':>14}{'baseline(ms)':>15}{'change':>10}  payload")
+    for n in args.sizes:
+        df = fixtures.synthetic_ohlcv(n)
+        for name in args.cases:
+            seconds, result = measure(CASES[name](n, df), args.repeat)
+            key = f"{name}@{n}"
+            results[key] = seconds
+
+            payload = f"{len(result):,} B" if isinstance(result, (bytes, str)) else ""
+            base = baseline.get(key)
+            change = ""
+            if base:
+                ratio = seconds / base - 1
+                change = f"{ratio:+.0%}"
+                if ratio > args.threshold:
+                    regressions.append(key)
+                    change += " !"
+            base_ms = f"{base * 1000:.2f}" if base else "-"
+            print(f"{name:<24}{n:>9,}{seconds * 1000:>14.2f}{base_ms:>15}{change:>10}  {payload}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True))
+        print(f"\n기준값 저장: {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\n성능 저하 {len(regressions)}건 (>{args.threshold:.0%}): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,43 +1,52 @@
 # 표준 라이브러리
 import datetime
-from io import BytesIO
 import os
 
 # 서드파티 라이브러리
 import streamlit as st
 import time
 import pandas as pd
-import FinanceDataReader as fdr
-from plotly.subplots import make_subplots
 import plotly.graph_objects as go
-from dotenv import load_dotenv
 import numpy as np
+from plotly.colors import DEFAULT_PLOTLY_COLORS
 
+from stockflow import charting
+from stockflow import company
+from stockflow import datasets
+from stockflow import export
+from stockflow import indicators
+from stockflow import live
+from stockflow import perf
+from stockflow import prefetch
+from stockflow import projection
+from stockflow import risk
+from stockflow import warmup
 
-load_dotenv()
 
-# 회사별 DF 불러오기
-@st.cache_data
+warmup.start()
+perf.begin_run("main")
+
+# 회사별 DF 불러오기 (로컬 캐시 우선, TTL이 지나면 백그라운드 갱신)
 def get_krx_company_list() -> pd.DataFrame:
     try:
-        url = 'http://kind.krx.co.kr/corpgeneral/corpList.do?method=download&searchType=13'
-        df_listing = pd.read_html(url, header=0, flavor='bs4', encoding='EUC-KR')[0]
-        df_listing = df_listing[['회사명', '종목코드']].copy()
-        df_listing['종목코드'] = df_listing['종목코드'].apply(lambda x: f'{x:06}')
-        return df_listing
+        return company.load_listing()
     except Exception as e:
         st.error(f"상장사 명단을 불러오는 데 실패했습니다: {e}")
         return pd.DataFrame(columns=['회사명', '종목코드'])
 
+def get_company_index() -> company.CompanyIndex | None:
+    if get_krx_company_list().empty:
+        return None
+    return company.get_index()
+
 # 종목코드|회사명으로 불러오기 가능
 def get_stock_code_by_company(company_name: str) -> str:
     if company_name.isdigit() and len(company_name) == 6:
         return company_name
 
-    company_df = get_krx_company_list()
-    codes = company_df[company_df['회사명'] == company_name]['종목코드'].values
-    if len(codes) > 0:
-        return codes[0]
+    code = company.resolve_code(company_name) if get_company_index() is not None else None
+    if code is not None:
+        return code
     else:
         raise ValueError(f"'{company_name}'을 찾을 수 없습니다. 종목코드 6자리를 직접 입력해보세요.")
 
@@ -45,8 +54,24 @@ def get_stock_code_by_company(company_name: str) -> str:
 
 
 #사이드바 설정
-company_name = st.sidebar.text_input('조회할 회사를 입력하세요')
-chart_type = st.sidebar.radio("Select Chart Type", ("Candle_Stick", "Line"), index=0)
+company_name = st.sidebar.text_input('조회할 회사를 입력하세요').strip()
+
+# 입력이 정확히 일치하지 않으면 접두어/유사도 기반 추천 종목 제시 (직접 고른 경우에만 추천 종목으로 바꾼다)
+if company_name and not (company_name.isdigit() and len(company_name) == 6):
+    company_index = get_company_index()
+    if company_index is not None and company_name not in company_index.by_name:
+        suggestions = company_index.suggest(company_name)
+        if suggestions:
+            names = {code: name for name, code in suggestions}
+            picked = st.sidebar.selectbox(
+                '추천 종목',
+                list(names),
+                index=None,
+                placeholder="추천 종목에서 선택",
+                format_func=lambda code: f"{names[code]} ({code})",
+            )
+            if picked is not None:
+                company_name = names[picked]
 
 today = datetime.datetime.today()
 jan_1 = datetime.date(today.year, 1, 1)
@@ -61,7 +86,7 @@ selected_dates = st.sidebar.date_input(
 confirm_btn = st.sidebar.button('조회하기')
 
 #인트로 화면
-if ("price_df" not in st.session_state) and (not confirm_btn):
+if ("price_key" not in st.session_state) and (not confirm_btn):
 
     st.title("📈 주가 대시보드")
 
@@ -133,56 +158,52 @@ if confirm_btn:
     try:
         with st.spinner('데이터를 수집하는 중...'):
             stock_code = get_stock_code_by_company(company_name)
-            start_date = selected_dates[0].strftime("%Y%m%d")
-            end_date = selected_dates[1].strftime("%Y%m%d")
-            price_df = fdr.DataReader(stock_code, start_date, end_date)
+            # 재무제표/뉴스는 주가를 받는 동안 백그라운드에서 미리 받아 둔다
+            prefetch.start(stock_code, company_name, os.getenv("DART_API_KEY"))
+            price_key = (stock_code, selected_dates[0].isoformat(), selected_dates[1].isoformat())
+            price_df = datasets.get_prices(price_key)
 
         if price_df.empty:
             st.info("해당 기간의 주가 데이터가 없습니다.")
         else:
             st.session_state["company_name"] = company_name
-            st.session_state["price_df"] = price_df
+            st.session_state["stock_code"] = stock_code
+            warmup.record_request(stock_code)
+            # 세션에는 키만 저장하고 데이터는 프로세스 공유 캐시에서 꺼내 쓴다
+            st.session_state["price_key"] = price_key
 
     except Exception as e:
         st.error(f"오류가 발생했습니다: {e}")
 
-# 주가 데이터가 있으면 차트 및 통계 표시
-if "price_df" in st.session_state:
-    price_df = st.session_state["price_df"]
-    company_name = st.session_state.get("company_name", "Company")
+# 조회된 주가 + 지표 (종목·기간 키 기준 캐시)
+def current_prices():
+    price_df = datasets.get_prices(st.session_state["price_key"])
+    # 이동평균/낙폭/변동성/상승비율은 공용 지표 모듈에서 한 번에 계산 (종목·기간별 캐시)
+    with perf.span("indicators"):
+        ind = indicators.get_indicators(st.session_state.get("price_key"), price_df["Close"])
+    return price_df, ind
 
-    st.subheader(f"[{company_name}]")
-
-    low_price = price_df['Low'].min()
-    high_price = price_df['High'].max()
-    low_date = price_df['Low'].idxmin()
-    high_date = price_df['High'].idxmax()
-
-    price_df["MA5"] = price_df["Close"].rolling(5).mean()
-    price_df["MA20"] = price_df["Close"].rolling(20).mean()
-    price_df["MA60"] = price_df["Close"].rolling(60).mean()
-    price_df["MA120"] = price_df["Close"].rolling(120).mean()
 
+# 위젯이 바뀌면 해당 프래그먼트만 다시 실행 (전체 스크립트 rerun 없음)
 #상단 최저가/최고가 메트릭
+@st.fragment
+@perf.fragment("main.metrics")
+def metrics_fragment():
+    price_df, ind = current_prices()
     close = price_df["Close"].dropna()
     if len(close) >= 2:
         start_close = float(close.iloc[0])
         end_close = float(close.iloc[-1])
 
         diff = end_close - start_close
-        pct = (diff / start_close) * 100
 
-        period_return = pct
+        period_return = ind.period_return
 
         high_close = float(close.max())
         low_close = float(close.min())
 
-        cummax = close.cummax()
-        drawdown = (close / cummax) - 1.0
-        mdd = float(drawdown.min() * 100)
-
-        daily_ret = close.pct_change().dropna()
-        vol_annual = float(daily_ret.std() * np.sqrt(252) * 100) if len(daily_ret) > 1 else 0.0
+        mdd = ind.mdd
+        vol_annual = ind.vol_annual
 
         arrow = "▲" if diff > 0 else ("▼" if diff < 0 else "—")
         diff_abs = abs(diff)
@@ -203,100 +224,260 @@ if "price_df" in st.session_state:
     else:
         st.info("지표를 계산할 데이터가 부족합니다.")
 
-#차트 그리기
-    fig = make_subplots(rows=1, cols=1, shared_xaxes=True)
 
+# 롤링 위험 지표 (종목·기간·지수·창 길이별 캐시). 지수는 주가와 같은 공유 데이터셋 캐시/로컬 저장소에서 가져온다
+def current_risk(price_df: pd.DataFrame, windows: list[int], bench_name: str) -> risk.RollingRisk:
+    price_key = st.session_state["price_key"]
+    bench_key = (risk.BENCHMARKS[bench_name], price_key[1], price_key[2])
+    try:
+        bench_df = datasets.get_prices(bench_key)
+        bench_close = bench_df["Close"] if "Close" in bench_df.columns else None
+    except Exception as e:
+        st.warning(f"{bench_name} 지수를 불러오지 못해 베타/상관계수는 생략합니다: {e}")
+        bench_close = None
+    if bench_close is None:
+        bench_key = None
+    with perf.span("risk"):
+        return risk.get_risk(price_key, price_df["Close"], bench_key, bench_close, windows)
+
+
+def add_risk_traces(fig, rolling: risk.RollingRisk, windows: list[int]) -> None:
+    for i, w in enumerate(windows):
+        color = DEFAULT_PLOTLY_COLORS[i % len(DEFAULT_PLOTLY_COLORS)]
+        lines = [("mdd", 2, "MDD", "solid"), ("vol", 3, "변동성", "solid")]
+        if rolling.beta:
+            lines += [("beta", 4, "베타", "solid"), ("corr", 4, "상관계수", "dot")]
+        for name, row, label, dash in lines:
+            series = charting.downsample_line(rolling.series(name, w))
+            fig.add_trace(
+                go.Scattergl(
+                    x=series.index, y=series, mode="lines",
+                    name=f"{label} {w}일", legendgroup=f"w{w}",
+                    line=dict(color=color, width=1.5, dash=dash),
+                ),
+                row=row, col=1
+            )
+
+
+#차트 그리기 (기간이 길면 주봉/월봉으로 리샘플링, 라인은 LTTB 다운샘플링 + WebGL)
+#위험 지표를 켜면 가격 아래에 롤링 최대낙폭/변동성/베타·상관계수를 같은 x축으로 그린다
+@st.fragment
+@perf.fragment("main.chart")
+def chart_fragment():
+    price_df, _ = current_prices()
+    chart_type = st.radio("Select Chart Type", ("Candle_Stick", "Line"), index=0, horizontal=True)
+
+    rolling, windows, bench_name = None, [], None
+    if st.toggle("롤링 위험 지표 (최대낙폭·변동성·베타)", value=False):
+        w_col, b_col = st.columns([2, 1])
+        with w_col:
+            windows = sorted(st.multiselect("창 길이(거래일)", list(risk.WINDOWS), default=[60]))
+        with b_col:
+            bench_name = st.radio("비교 지수", list(risk.BENCHMARKS), horizontal=True)
+        if windows:
+            rolling = current_risk(price_df, windows, bench_name)
+
+    # 서브플롯은 조회 후 차트에서만 쓰므로 인트로 화면 로드 시에는 불러오지 않는다
+    from plotly.subplots import make_subplots
+
+    with perf.span("figure.price_chart", chart_type=chart_type):
+        if rolling is None:
+            fig = make_subplots(rows=1, cols=1, shared_xaxes=True)
+        else:
+            beta_title = f"{bench_name} 대비 베타 / 상관계수(점선)" if rolling.beta else "베타 / 상관계수 (지수 데이터 없음)"
+            fig = make_subplots(
+                rows=4, cols=1, shared_xaxes=True, vertical_spacing=0.04,
+                row_heights=[0.52, 0.16, 0.16, 0.16],
+                subplot_titles=("", "롤링 최대낙폭(%)", "롤링 변동성(연환산, %)", beta_title),
+            )
+            fig.update_layout(height=900)
 
-#radio에 따른 차트 그리기
-    if chart_type == "Candle_Stick":
+        #radio에 따른 차트 그리기
+        chart_df = price_df
+        if chart_type == "Candle_Stick":
+            chart_df, bar_label = charting.auto_resample(price_df)
             fig.add_trace(
                 go.Candlestick(
-                    x=price_df.index,
-                    open=price_df['Open'],
-                    high=price_df['High'],
-                    low=price_df['Low'],
-                    close=price_df['Close'],
+                    x=chart_df.index,
+                    open=chart_df['Open'],
+                    high=chart_df['High'],
+                    low=chart_df['Low'],
+                    close=chart_df['Close'],
                     name="Price"
                 ),
                 row=1, col=1
             )
             fig.update_layout(xaxis_rangeslider_visible=False)
-    else:
-        fig.add_trace(
-            go.Scatter(
-                x=price_df.index,
-                y=price_df['Close'],
-                mode='lines',
-                name='Close'
-            ),
-            row=1, col=1
+            if bar_label != "일봉":
+                st.caption(f"조회 기간이 길어 {bar_label}으로 표시합니다.")
+        else:
+            line = charting.downsample_line(price_df['Close'])
+            fig.add_trace(
+                go.Scattergl(
+                    x=line.index,
+                    y=line,
+                    mode='lines',
+                    name='Close'
+                ),
+                row=1, col=1
+            )
+
+        if rolling is not None:
+            add_risk_traces(fig, rolling, windows)
+
+        #최저가/최고가 표 x,y좌표에 표식 (주봉/월봉이면 극값이 들어 있는 봉의 날짜를 가리킨다)
+        low_price = chart_df['Low'].min()
+        high_price = chart_df['High'].max()
+        low_date = chart_df['Low'].idxmin()
+        high_date = chart_df['High'].idxmax()
+        fig.add_annotation(
+            x=low_date, y=low_price,
+            text=f"최저가<br>{low_price:,.0f}",
+            showarrow=True, arrowhead=2,
+            arrowcolor="blue",
+            font=dict(color="blue"),
+            ay=40
         )
 
-    fig.add_annotation(
-        x=low_date, y=low_price,
-        text=f"최저가<br>{low_price:,}",
-        showarrow=True, arrowhead=2,
-        arrowcolor="blue",
-        font=dict(color="blue"),
-        ay=40
-    )
+        fig.add_annotation(
+            x=high_date, y=high_price,
+            text=f"최고가<br>{high_price:,.0f}",
+            showarrow=True, arrowhead=2,
+            arrowcolor="red",
+            font=dict(color="red"),
+            ay=-40
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    if perf.debug_enabled():
+        perf.payload("plotly.price_chart", len(fig.to_json()))
+
+
+#장중 실시간 갱신: 새 봉만 받아 지표를 증분 갱신 (같은 종목을 보는 세션끼리 폴링/트래커 공유)
+@st.fragment(run_every=live.POLL_INTERVAL)
+@perf.fragment("main.live")
+def live_fragment():
+    price_key = st.session_state["price_key"]
+    price_df = datasets.get_prices(price_key)
+    tracker = live.get_tracker(price_key, price_df["Close"])
+    if live.market_open():
+        try:
+            tracker.refresh(price_key[0])
+        except Exception as e:
+            st.warning(f"실시간 시세를 받아오지 못했습니다: {e}")
+    else:
+        st.caption("지금은 장 시간이 아니어서 마지막 시세를 표시합니다.")
+
+    v = tracker.values()
+    st.caption(f"{v['date']:%Y-%m-%d} 기준 · {datetime.datetime.now(live.KST):%H:%M:%S} 갱신 · {live.POLL_INTERVAL}초마다 확인")
+
+    c1, c2, c3, c4 = st.columns(4)
+    diff = v["close"] - v["prev_close"] if v["prev_close"] else 0.0
+    c1.metric("현재가(실시간)", f"{v['close']:,.0f}", f"{diff:+,.0f}")
+    c2.metric("기간 수익률", f"{v['period_return']:.2f}%")
+    c3.metric("고점 대비", f"{v['drawdown']:.2f}%", f"MDD {v['mdd']:.2f}%", delta_color="off")
+    c4.metric("상승일 비율", "-" if pd.isna(v["up_prob"]) else f"{v['up_prob']:.1f}%")
+
+    ma_cols = st.columns(len(v["ma"]))
+    for col, (w, value) in zip(ma_cols, v["ma"].items()):
+        col.metric(f"MA{w}", "-" if pd.isna(value) else f"{value:,.0f}")
+
+    # 히스토리 차트는 그대로 두고 장중에 받은 가격만 따로 그린다
+    ticks = tracker.tick_series()
+    if len(ticks) >= 2:
+        st.line_chart(ticks, height=200)
+
+
+#오를까/내릴까: 조회 기간의 일간 수익률로 향후 N거래일을 몬테카를로 시뮬레이션 (종목·기간·전망 기간별 캐시)
+@st.fragment
+@perf.fragment("main.projection")
+def projection_fragment():
+    price_df, _ = current_prices()
+    h_col, m_col = st.columns([1, 2])
+    with h_col:
+        horizon = st.selectbox("전망 기간", [20, 60, 120, 250], index=1, format_func=lambda d: f"{d}거래일")
+    with m_col:
+        method = st.radio("시뮬레이션 방식", list(projection.METHODS), format_func=projection.METHODS.get, horizontal=True)
 
-    fig.add_annotation(
-        x=high_date, y=high_price,
-        text=f"최고가<br>{high_price:,}",
-        showarrow=True, arrowhead=2,
-        arrowcolor="red",
-        font=dict(color="red"),
-        ay=-40
+    try:
+        proj = projection.get_projection(st.session_state["price_key"], price_df["Close"], horizon, method)
+    except ValueError as e:
+        st.info(str(e))
+        return
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("오를까?👍", f"{proj.p_up:.1f}%")
+    c2.metric("내릴까?👎️", f"{100 - proj.p_up:.1f}%")
+    c3.metric("예상 가격(중앙값)", f"{proj.final_percentile(50):,.0f}",
+              f"{(proj.final_percentile(50) / proj.last_close - 1) * 100:+.2f}%")
+    c4.metric("예상 최대낙폭(중앙값)", f"{np.median(proj.drawdowns):.2f}%")
+
+    from plotly.subplots import make_subplots
+
+    with perf.span("figure.projection"):
+        bands = proj.bands
+        fan_fig = make_subplots(rows=1, cols=2, column_widths=[0.65, 0.35],
+                                subplot_titles=("가격 범위 (5~95 백분위)", "경로별 최대낙폭 분포"))
+        for lo, hi, opacity in ((5, 95, 0.15), (25, 75, 0.3)):
+            fan_fig.add_trace(go.Scatter(x=bands.index, y=bands[hi], mode="lines", line=dict(width=0),
+                                         showlegend=False, hoverinfo="skip"), row=1, col=1)
+            fan_fig.add_trace(go.Scatter(x=bands.index, y=bands[lo], mode="lines", line=dict(width=0),
+                                         fill="tonexty", fillcolor=f"rgba(31,119,180,{opacity})",
+                                         name=f"{lo}~{hi}%"), row=1, col=1)
+        fan_fig.add_trace(go.Scatter(x=bands.index, y=bands[50], mode="lines", name="중앙값",
+                                     line=dict(color="rgb(31,119,180)")), row=1, col=1)
+        fan_fig.add_hline(y=proj.last_close, line_dash="dot", line_color="gray", row=1, col=1)
+        fan_fig.add_trace(go.Histogram(x=proj.drawdowns, nbinsx=50, name="최대낙폭(%)", showlegend=False), row=1, col=2)
+        fan_fig.update_xaxes(title_text="경과 거래일", row=1, col=1)
+        fan_fig.update_xaxes(title_text="최대낙폭(%)", row=1, col=2)
+        fan_fig.update_yaxes(tickformat=",", row=1, col=1)
+        fan_fig.update_layout(height=360, margin=dict(l=10, r=10, t=50, b=10),
+                              legend=dict(orientation="h", yanchor="bottom", y=-0.3))
+        st.plotly_chart(fan_fig, use_container_width=True)
+    st.caption(
+        f"{projection.METHODS[method]} 방식으로 {proj.n_paths:,}개 경로를 시뮬레이션한 결과입니다. "
+        "과거 수익률 분포가 그대로 이어진다고 가정하므로 참고용으로만 보세요."
     )
-    st.plotly_chart(fig, use_container_width=True)
 
 
-#최저가/최고가 표 x,y좌표에 표식
+#주가 데이터 다운로드 버튼 (버튼을 눌렀을 때만 파일 생성, 같은 데이터는 캐시 재사용)
+@st.fragment
+@perf.fragment("main.export")
+def export_fragment(company_name: str):
+    price_df, ind = current_prices()
+    export_format = st.selectbox("파일 형식", list(export.FORMATS), index=0)
+    ext, mime = export.FORMATS[export_format]
 
-    fig.add_annotation(
-        x=low_date, y=low_price,
-        text=f"최저가<br>{low_price:,}",
-        showarrow=True, arrowhead=2,
-        arrowcolor="blue",
-        font=dict(color="blue"),
-        ay=40
-    )
+    def build_export() -> bytes:
+        export_df = price_df.assign(**{f"MA{w}": ind.ma_series(w) for w in indicators.MA_WINDOWS})
+        return export.export_bytes(export_df, export_format)
 
-    fig.add_annotation(
-        x=high_date, y=high_price,
-        text=f"최고가<br>{high_price:,}",
-        showarrow=True, arrowhead=2,
-        arrowcolor="red",
-        font=dict(color="red"),
-        ay=-40
+    st.download_button(
+        label="📥 주가 데이터 다운로드",
+        data=build_export,
+        file_name=f"{company_name}_주가.{ext}",
+        mime=mime,
+        on_click="ignore"
     )
 
-    fig.update_layout(
-        title=f"{company_name} Stock Chart",
-        xaxis_title="Date",
-        yaxis_title="Price"
-    )
 
-    
-#하락/상승 확률 메트릭
-    LOOKBACK_DAYS = 60
-    rets = price_df["Close"].pct_change().dropna().tail(LOOKBACK_DAYS)
-    up_prob = (rets > 0).mean() * 100
-    down_prob = 100 - up_prob
+# 주가 데이터가 있으면 차트 및 통계 표시
+if "price_key" in st.session_state:
+    company_name = st.session_state.get("company_name", "Company")
+
+    st.subheader(f"[{company_name}]")
 
-    c3, c4 = st.columns(2)
-    c3.metric("오를까?👍", f"{up_prob:.1f}%")
-    c4.metric("내릴까?👎️", f"{down_prob:.1f}%")
+    metrics_fragment()
+    chart_fragment()
 
-#최근 10일간 주가 데이터 엑셀 다운로드 버튼
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        price_df.to_excel(writer, index=True, sheet_name='Sheet1')
+    # 조회 기간에 오늘이 포함될 때만 실시간 갱신 제공
+    if st.session_state["price_key"][2] >= datetime.date.today().isoformat():
+        if st.toggle("실시간 갱신 (장중)", value=False):
+            live_fragment()
 
-    st.download_button(
-        label="📥 엑셀 파일 다운로드",
-        data=output.getvalue(),
-        file_name=f"{company_name}_주가.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+#하락/상승 전망
+    projection_fragment()
+
+    export_fragment(company_name)
+
+perf.render_debug_panel()
+perf.end_run()
@@ -1,51 +1,37 @@
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
-from dotenv import load_dotenv
 
-load_dotenv()
+from stockflow import datasets
+from stockflow import indicators
+from stockflow import perf
+from stockflow import warmup
+
+warmup.start()
 
 st.set_page_config(page_title="Indicators", layout="wide")
+perf.begin_run("indicators")
 st.title("부가 지표 (이동평균선 / 거래량)")
 
-if "price_df" not in st.session_state:
+if "price_key" not in st.session_state:
     st.warning("먼저 메인 페이지에서 종목을 조회해 주세요.")
     st.stop()
 
-price_df = st.session_state["price_df"].copy()
+price_df = datasets.get_prices(st.session_state["price_key"])
 company_name = st.session_state.get("company_name", "Company")
 st.subheader(f"[{company_name}] 부가 분석 지표")
 
-price_df["MA5"] = price_df["Close"].rolling(5, min_periods=1).mean()
-price_df["MA20"] = price_df["Close"].rolling(20, min_periods=1).mean()
-price_df["MA60"] = price_df["Close"].rolling(60, min_periods=1).mean()
-price_df["MA120"] = price_df["Close"].rolling(120, min_periods=1).mean()
-
-def last_cross(series_a: pd.Series, series_b: pd.Series, lookback=60):
-    a = series_a.dropna()
-    b = series_b.dropna()
-    idx = a.index.intersection(b.index)
-    if len(idx) < 3:
-        return None, None
-    a = a.loc[idx].tail(lookback)
-    b = b.loc[idx].tail(lookback)
-    diff = a - b
-    sign = diff.apply(lambda x: 1 if x > 0 else (-1 if x < 0 else 0))
-    sign_shift = sign.shift(1)
-    cross_points = sign[(sign != sign_shift) & (sign != 0) & (sign_shift != 0)]
-    if cross_points.empty:
-        return None, None
-    last_idx = cross_points.index[-1]
-    direction = "골든크로스" if diff.loc[last_idx] > 0 else "데드크로스"
-    return direction, last_idx
-
-cross_5_20, cross_5_20_date = last_cross(price_df["MA5"], price_df["MA20"], lookback=90)
+# 메인 페이지와 같은 캐시된 지표를 재사용 (이동평균은 min_periods=1 버전)
+with perf.span("indicators"):
+    ind = indicators.get_indicators(st.session_state.get("price_key"), price_df["Close"])
+ma = {w: ind.ma_series(w, partial=True) for w in indicators.MA_WINDOWS}
+
+cross_5_20, cross_5_20_date = indicators.last_cross(ind, 5, 20, lookback=90)
 
 ma_fig = go.Figure()
-ma_fig.add_trace(go.Scatter(x=price_df.index, y=price_df["MA5"], mode="lines", name="MA 5"))
-ma_fig.add_trace(go.Scatter(x=price_df.index, y=price_df["MA20"], mode="lines", name="MA 20"))
-ma_fig.add_trace(go.Scatter(x=price_df.index, y=price_df["MA60"], mode="lines", name="MA 60"))
-ma_fig.add_trace(go.Scatter(x=price_df.index, y=price_df["MA120"], mode="lines", name="MA 120"))
+ma_fig.add_trace(go.Scatter(x=ma[5].index, y=ma[5], mode="lines", name="MA 5"))
+ma_fig.add_trace(go.Scatter(x=ma[20].index, y=ma[20], mode="lines", name="MA 20"))
+ma_fig.add_trace(go.Scatter(x=ma[60].index, y=ma[60], mode="lines", name="MA 60"))
+ma_fig.add_trace(go.Scatter(x=ma[120].index, y=ma[120], mode="lines", name="MA 120"))
 ma_fig.update_layout(
     title="Moving Averages (5 / 20 / 60 / 120)",
     xaxis_title="Date",
@@ -66,6 +52,8 @@ with c1:
         st.success(f"현재: (MA5 vs MA20) {cross_5_20}")
         st.caption("골든크로스=단기선이 중기/장기선을 상향 돌파, 데드크로스=하향 돌파")
 
+    st.page_link("pages/5이동평균_백테스트.py", label="다른 이동평균 조합의 과거 성과 비교하기 (백테스트)", icon="🧪")
+
 with c2:
     st.markdown(f"""
 ### 이동평균선(MA) 정의
@@ -135,3 +123,6 @@ if "Volume" in price_df.columns:
 """)
 else:
     st.info("거래량(Volume) 데이터가 없습니다.")
+
+perf.render_debug_panel()
+perf.end_run()
@@ -1,134 +1,134 @@
 import os
-import datetime
-import pandas as pd
 import streamlit as st
-import requests
-import feedparser
-from dotenv import load_dotenv
 
-load_dotenv()
+from stockflow import dart as dart_store
+from stockflow import facts
+from stockflow import news
+from stockflow import perf
+from stockflow import prefetch
+from stockflow import warmup
+
+warmup.start()
 
 st.set_page_config(page_title="재무제표 & 뉴스", layout="wide")
+perf.begin_run("financials_news")
 st.title("재무제표 & 최근 뉴스")
 
-if "price_df" not in st.session_state or "company_name" not in st.session_state:
+if "price_key" not in st.session_state or "company_name" not in st.session_state:
     st.warning("먼저 메인 페이지에서 종목을 조회해 주세요.")
     st.stop()
 
 company_name = st.session_state["company_name"]
+stock_code = st.session_state.get("stock_code")
 
 st.subheader(f"[{company_name}]")
 
-tab1, tab2 = st.tabs(["재무제표", "최근 뉴스"])
-
-with tab1:
+# 재무제표 표 (연도/보고서/종류 선택 시 이 프래그먼트만 다시 실행)
+@st.fragment
+@perf.fragment("financials_news.financials")
+def financial_fragment():
     st.markdown(f"### {company_name}재무제표")
     dart_api_key = os.getenv("DART_API_KEY")
 
     if not dart_api_key:
         st.info(".env에 DART_API_KEY가 없어서 재무제표를 불러올 수 없어요. (예: DART_API_KEY=xxxxxxxx)")
-        st.stop()
+        return
 
     try:
-        import OpenDartReader
+        # 메인 페이지에서 선택한 종목코드로 corp_code를 찾고, 없을 때만 회사명 정확 일치로 조회
+        with perf.span("dart.resolve"):
+            corp_code = dart_store.resolve_corp_code(dart_api_key, stock_code=stock_code, corp_name=company_name)
 
-        dart = OpenDartReader(dart_api_key)
+        if corp_code is None:
+            st.error("DART에서 해당 종목을 찾지 못했습니다. (메인 페이지에서 종목을 다시 조회해 주세요)")
+            return
 
-        corp_list = dart.corp_codes
-        if corp_list is None or corp_list.empty:
-            st.error("DART 기업 목록(corp_codes)을 불러오지 못했습니다.")
-            st.stop()
+        years = dart_store.recent_years()
 
-        hit = corp_list[corp_list["corp_name"] == company_name]
-        if hit.empty:
-            hit = corp_list[corp_list["corp_name"].str.contains(company_name, na=False)]
+        # 회사가 바뀌면 4개 연도 × 4개 보고서를 백그라운드에서 한 번에 받아 둔다
+        if st.session_state.get("finstate_prefetched") != corp_code:
+            dart_store.prefetch_finstates(dart_api_key, corp_code, years)
+            st.session_state["finstate_prefetched"] = corp_code
 
-        if hit.empty:
-            st.error("DART에서 해당 회사명을 찾지 못했습니다. (회사명 정확히 입력 필요)")
-            st.stop()
-
-        corp_code = hit.iloc[0]["corp_code"]
-
-        today = datetime.date.today()
-        year = today.year
-
-        y = st.selectbox("연도 선택", [year, year - 1, year - 2, year - 3], index=1)
         report = st.selectbox("보고서", ["11011(사업보고서)", "11012(반기보고서)", "11013(1분기)", "11014(3분기)"], index=0)
         reprt_code = report.split("(")[0]
 
         fs_div = st.selectbox("재무제표 종류", ["CFS(연결)", "OFS(별도)"], index=0).split("(")[0]
 
-        fs = dart.finstate(corp=corp_code, bsns_year=y, reprt_code=reprt_code)
+        # 선택한 보고서 + 지표 계산용 사업보고서의 연도별 팩트 (수집 시 한 번만 숫자로 변환된 저장소에서 읽음)
+        with perf.span("facts.load", reprt_code=reprt_code):
+            corp_facts = facts.load_facts(dart_api_key, corp_code, years, sorted({reprt_code, dart_store.DEFAULT_REPORT}))
 
-        if fs is None or (hasattr(fs, "empty") and fs.empty):
+        if corp_facts.empty:
             st.info("해당 조건의 재무제표 데이터가 없습니다.")
-            st.stop()
-
-        if "fs_div" in fs.columns:
-            fs_filtered = fs[fs["fs_div"] == fs_div].copy()
+            return
 
-            # 연결(CFS)이 없는 회사는 비어있을 수 있어서 fallback
-            if fs_filtered.empty:
+        # 연결(CFS)이 없는 회사는 비어있을 수 있어서 fallback
+        if not ((corp_facts["fs_div"] == fs_div) & (corp_facts["report"] == reprt_code)).any():
+            if fs_div != "OFS":
                 st.info(f"{fs_div} 데이터가 없어서 OFS(별도)로 표시합니다.")
-                fs_filtered = fs[fs["fs_div"] == "OFS"].copy()
-        else:
-            fs_filtered = fs.copy()
-
-        fs = fs_filtered
+            fs_div = "OFS"
 
-
-        if fs is None or (hasattr(fs, "empty") and fs.empty):
+        table = facts.pivot(corp_facts, fs_div, reprt_code)
+        if table.empty:
             st.info("해당 조건의 재무제표 데이터가 없습니다.")
+            return
+
+        st.markdown("#### 연도별 재무제표")
+        st.dataframe(table.style.format("{:,.0f}", na_rep="-"), use_container_width=True)
+
+        st.markdown("#### 빠른 요약(주요 계정)")
+        summary = facts.pivot(corp_facts, fs_div, reprt_code, facts.KEY_ACCOUNTS)
+        if not summary.empty:
+            s1, s2 = st.columns([1, 1])
+            with s1:
+                st.table(summary.style.format("{:,.0f}", na_rep="-"))
+            with s2:
+                st.bar_chart(summary.T.rename(index=str))
         else:
-            cols_keep = [c for c in ["fs_div", "sj_div", "sj_nm", "account_nm", "thstrm_amount", "frmtrm_amount", "bfefrmtrm_amount", "currency"] if c in fs.columns]
-            fs_view = fs[cols_keep].copy()
-
-            for col in ["thstrm_amount", "frmtrm_amount", "bfefrmtrm_amount"]:
-                if col in fs_view.columns:
-                    fs_view[col] = (
-                        fs_view[col]
-                        .astype(str)
-                        .str.replace(",", "", regex=False)
-                        .str.replace("None", "", regex=False)
-                    )
-                    fs_view[col] = pd.to_numeric(fs_view[col], errors="coerce")
-
-            st.dataframe(fs_view, use_container_width=True)
-
-            st.markdown("#### 빠른 요약(주요 계정)")
-            key_accounts = ["매출액", "영업이익", "당기순이익", "자산총계", "부채총계", "자본총계"]
-            if "account_nm" in fs_view.columns and "thstrm_amount" in fs_view.columns:
-                summary = fs_view[fs_view["account_nm"].isin(key_accounts)][["account_nm", "thstrm_amount"]].dropna()
-                if not summary.empty:
-                    summary = summary.drop_duplicates("account_nm").set_index("account_nm")
-                    st.table(summary.style.format("{:,.0f}"))
-                else:
-                    st.info("주요 계정(매출/이익/자산 등)이 이 보고서에서 바로 매칭되지 않았어요. 표에서 검색해서 확인해 주세요.")
+            st.info("주요 계정(매출/이익/자산 등)이 이 보고서에서 바로 매칭되지 않았어요. 표에서 검색해서 확인해 주세요.")
+
+        st.markdown("#### 투자 지표 (사업보고서 · 연말 종가 기준)")
+        with perf.span("facts.ratios"):
+            ratios = facts.valuation_ratios(dart_api_key, corp_code, stock_code, corp_facts, fs_div)
+        if ratios.empty:
+            st.info("사업보고서 데이터가 없어 투자 지표를 계산할 수 없습니다.")
+        else:
+            st.dataframe(
+                ratios.style.format({
+                    "연말 종가": "{:,.0f}", "EPS": "{:,.0f}", "BPS": "{:,.0f}",
+                    "PER": "{:.2f}", "PBR": "{:.2f}", "ROE(%)": "{:.2f}", "부채비율(%)": "{:.2f}",
+                }, na_rep="-"),
+                use_container_width=True,
+            )
+            st.caption("PER=연말 종가/EPS, PBR=연말 종가/BPS (발행주식 총수 기준). 적자·자본잠식 연도는 표시하지 않습니다.")
 
     except Exception as e:
         st.error(f"재무제표 불러오기 오류: {e}")
 
-with tab2:
+
+# 뉴스 목록 (키워드/기사 개수 변경 시 이 프래그먼트만 다시 실행, 캐시된 기사 목록을 잘라서 표시)
+@st.fragment
+@perf.fragment("financials_news.news")
+def news_fragment():
     st.markdown("### 최근 뉴스 (Google News RSS)")
 
     q = st.text_input("검색 키워드", value=company_name)
     num = st.slider("기사 개수", 5, 30, 10)
 
-    rss_url = "https://news.google.com/rss/search"
-    params = {"q": q, "hl": "ko", "gl": "KR", "ceid": "KR:ko"}
-
     try:
-        r = requests.get(rss_url, params=params, timeout=10)
-        r.raise_for_status()
-        feed = feedparser.parse(r.text)
+        with perf.span("news.get"):
+            entries = news.get_news(q)
 
-        if not feed.entries:
+        if entries is None:
+            st.info("뉴스를 불러오는 중입니다. 잠시 후 다시 확인해 주세요.")
+        elif not entries:
             st.info("검색 결과가 없습니다.")
         else:
-            for i, item in enumerate(feed.entries[:num], start=1):
-                title = item.get("title", "")
-                link = item.get("link", "")
-                published = item.get("published", "")
+            for i, item in enumerate(entries[:num], start=1):
+                title = item["title"]
+                link = item["link"]
+                published = item["published"]
 
                 st.markdown(f"**{i}. {title}**")
                 if published:
@@ -139,3 +139,36 @@ with tab2:
 
     except Exception as e:
         st.error(f"뉴스 불러오기 오류: {e}")
+
+
+# 메인 페이지 '조회하기'에서 시작한 프리페치가 끝나면 페이지 전체를 한 번 다시 그린다
+@st.fragment(run_every=1.0)
+def wait_for_prefetch():
+    if not prefetch.pending(stock_code, company_name):
+        st.rerun()
+
+
+pending = prefetch.pending(stock_code, company_name)
+
+tab1, tab2 = st.tabs(["재무제표", "최근 뉴스"])
+
+with tab1:
+    if "dart" in pending:
+        st.markdown(f"### {company_name}재무제표")
+        st.info("재무제표를 불러오는 중입니다...")
+    else:
+        financial_fragment()
+
+with tab2:
+    if "news" in pending:
+        st.markdown("### 최근 뉴스 (Google News RSS)")
+        st.info("뉴스를 불러오는 중입니다...")
+    else:
+        news_fragment()
+
+if pending:
+    wait_for_prefetch()
+
+
+perf.render_debug_panel()
+perf.end_run()
@@ -0,0 +1,93 @@
+import datetime
+
+import streamlit as st
+import plotly.graph_objects as go
+
+from stockflow import company
+from stockflow import compare
+from stockflow import perf
+from stockflow import warmup
+
+warmup.start()
+
+st.set_page_config(page_title="종목 비교", layout="wide")
+perf.begin_run("compare")
+st.title("여러 종목 비교")
+
+st.caption("회사명 또는 종목코드(6자리)를 쉼표/줄바꿈으로 구분해 입력하고 ‘비교하기’를 눌러주세요. (최대 30개)")
+
+MAX_TICKERS = 30
+
+names_text = st.text_area("비교할 종목", value=st.session_state.get("company_name", ""), height=100)
+
+today = datetime.date.today()
+selected_dates = st.date_input(
+    '비교할 기간을 선택하세요',
+    (datetime.date(today.year, 1, 1), today),
+    format="MM.DD.YYYY",
+)
+
+compare_btn = st.button('비교하기')
+
+if compare_btn:
+    queries = company.split_queries(names_text, MAX_TICKERS)
+
+    if len(queries) < 2 or len(selected_dates) != 2:
+        st.warning("2개 이상의 종목과 시작/종료 날짜를 선택해 주세요.")
+    else:
+        try:
+            codes, not_found = company.resolve_many(queries)
+
+            with st.spinner(f'{len(codes)}개 종목 데이터를 수집하는 중...'):
+                with perf.span("compare.fetch_many", tickers=len(codes)):
+                    frames, errors = compare.fetch_many(list(codes), selected_dates[0], selected_dates[1])
+
+            if not_found:
+                st.warning(f"찾을 수 없는 종목: {', '.join(not_found)}")
+            for code, msg in errors.items():
+                st.warning(f"{codes[code]}({code}): {msg}")
+
+            if len(frames) >= 2:
+                closes = compare.align_closes(frames)
+                closes.columns = [f"{codes[c]}({c})" for c in closes.columns]
+                st.session_state["compare_result"] = compare.matrix_metrics(closes)
+            else:
+                st.info("비교할 수 있는 종목이 2개 미만입니다.")
+
+        except Exception as e:
+            st.error(f"오류가 발생했습니다: {e}")
+
+if "compare_result" in st.session_state:
+    normalized, corr, summary = st.session_state["compare_result"]
+
+    norm_fig = go.Figure()
+    for col in normalized.columns:
+        norm_fig.add_trace(go.Scatter(x=normalized.index, y=normalized[col], mode="lines", name=col))
+    norm_fig.update_layout(
+        title="정규화 수익률 (시작일 = 100)",
+        xaxis_title="Date",
+        yaxis_title="Index",
+        margin=dict(l=10, r=10, t=50, b=10)
+    )
+    st.plotly_chart(norm_fig, use_container_width=True)
+
+    c1, c2 = st.columns([1, 1])
+    with c1:
+        st.markdown("#### 종목별 지표")
+        st.dataframe(summary.style.format("{:.2f}"), use_container_width=True)
+    with c2:
+        st.markdown("#### 일간 수익률 상관계수")
+        corr_fig = go.Figure(
+            data=[go.Heatmap(
+                z=corr.values,
+                x=corr.columns,
+                y=corr.index,
+                zmin=-1, zmax=1,
+                colorscale="RdBu_r"
+            )]
+        )
+        corr_fig.update_layout(margin=dict(l=10, r=10, t=10, b=10))
+        st.plotly_chart(corr_fig, use_container_width=True)
+
+perf.render_debug_panel()
+perf.end_run()
@@ -0,0 +1,99 @@
+import math
+
+import streamlit as st
+
+from stockflow import perf
+from stockflow import screener
+from stockflow import warmup
+
+warmup.start()
+
+st.set_page_config(page_title="전 종목 스크리너", layout="wide")
+perf.begin_run("screener")
+st.title("전 종목 스크리너")
+
+
+# 스냅샷 파일이 갱신(mtime 변경)되면 다시 읽는다
+@st.cache_data(max_entries=2, show_spinner=False)
+def load_snapshot(mtime: float):
+    return screener.load_snapshot()
+
+
+if not screener.SNAPSHOT_PATH.exists():
+    st.info("아직 스크리너 스냅샷이 없습니다. 서버에서 `python -m stockflow.screener --refresh`를 실행해 주세요.")
+    st.stop()
+
+with perf.span("screener.load"):
+    snapshot = load_snapshot(screener.SNAPSHOT_PATH.stat().st_mtime)
+
+st.caption(
+    f"기준일 {snapshot['기준일'].max():%Y-%m-%d} · 최근 {screener.PERIOD_DAYS}일 · {len(snapshot):,}개 종목 "
+    "(매일 장 마감 후 갱신)"
+)
+
+# 슬라이더 범위는 스냅샷의 최소/최대값 (정수로 내림/올림). 값이 없으면 0~1
+def bounds(col: str) -> tuple[int, int]:
+    values = snapshot[col].dropna()
+    if values.empty:
+        return 0, 1
+    lo, hi = math.floor(values.min()), math.ceil(values.max())
+    return lo, max(hi, lo + 1)
+
+
+ret_bounds = bounds("기간 수익률(%)")
+mdd_bounds = bounds("최대낙폭(%)")
+vol_bounds = bounds("변동성(연환산, %)")
+
+# 기본값(전체 범위)에서 움직인 슬라이더만 필터로 적용 → 기본 상태에서는 값이 없는(NaN) 종목도 빠지지 않는다
+with st.expander("필터", expanded=True):
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        name_query = st.text_input("회사명/종목코드 포함")
+        ret_range = st.slider("기간 수익률(%)", *ret_bounds, ret_bounds)
+    with c2:
+        mdd_min = st.slider("최대낙폭(%) 이상", *mdd_bounds, mdd_bounds[0])
+        vol_max = st.slider("변동성(연환산, %) 이하", *vol_bounds, vol_bounds[1])
+    with c3:
+        up_min = st.slider("상승일 비율(%) 이상", 0, 100, 0)
+        min_days = st.number_input("최소 거래일수", 0, 400, 20)
+
+sort_col, order_col = st.columns([3, 1])
+with sort_col:
+    sort_by = st.selectbox(
+        "정렬 기준",
+        ["기간 수익률(%)", "최대낙폭(%)", "변동성(연환산, %)", "상승일 비율(%)", "현재가", "회사명"],
+    )
+with order_col:
+    ascending = st.radio("순서", ["내림차순", "오름차순"], horizontal=True) == "오름차순"
+
+with perf.span("screener.filter", rows=len(snapshot)):
+    mask = snapshot["거래일수"] >= min_days
+    if tuple(ret_range) != ret_bounds:
+        mask &= snapshot["기간 수익률(%)"].between(*ret_range)
+    if mdd_min > mdd_bounds[0]:
+        mask &= snapshot["최대낙폭(%)"] >= mdd_min
+    if vol_max < vol_bounds[1]:
+        mask &= snapshot["변동성(연환산, %)"] <= vol_max
+    if up_min > 0:
+        mask &= snapshot["상승일 비율(%)"] >= up_min
+    if name_query.strip():
+        q = name_query.strip()
+        mask &= snapshot["회사명"].str.contains(q, case=False, regex=False) | snapshot.index.str.contains(q, regex=False)
+    result = snapshot[mask].sort_values(sort_by, ascending=ascending).drop(columns="기준일")
+
+st.write(f"조건에 맞는 종목 {len(result):,}개 (전체 {len(snapshot):,}개 중)")
+st.dataframe(
+    result,
+    use_container_width=True,
+    height=600,
+    column_config={
+        "현재가": st.column_config.NumberColumn(format="%.0f"),
+        "기간 수익률(%)": st.column_config.NumberColumn(format="%.2f"),
+        "최대낙폭(%)": st.column_config.NumberColumn(format="%.2f"),
+        "변동성(연환산, %)": st.column_config.NumberColumn(format="%.2f"),
+        "상승일 비율(%)": st.column_config.NumberColumn(format="%.1f"),
+    },
+)
+
+perf.render_debug_panel()
+perf.end_run()
@@ -0,0 +1,138 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import plotly.graph_objects as go
+
+from stockflow import backtest
+from stockflow import company
+from stockflow import compare
+from stockflow import perf
+from stockflow import warmup
+
+warmup.start()
+
+st.set_page_config(page_title="이동평균 백테스트", layout="wide")
+perf.begin_run("backtest")
+st.title("이동평균 교차 전략 백테스트")
+
+st.caption(
+    "단기 이동평균이 장기 이동평균 위에 있으면 다음 날 매수·보유, 아래로 내려가면 다음 날 매도하는 전략을 "
+    "(단기, 장기) 조합 전체에 대해 한 번에 계산합니다."
+)
+
+MAX_TICKERS = 10
+
+
+# (종목들, 기간, 격자, 비용)이 같으면 다시 계산하지 않는다
+@st.cache_data(max_entries=16, show_spinner=False)
+def run_grid(key, shorts, longs, cost, _closes):
+    with perf.span("backtest.grid", tickers=len(_closes), pairs=len(shorts) * len(longs)):
+        return backtest.backtest_many(_closes, shorts, longs, cost)
+
+
+def heatmap(df: pd.DataFrame, title: str, colorscale: str, zmid=None) -> go.Figure:
+    fig = go.Figure(
+        data=[go.Heatmap(
+            z=df.values,
+            x=[str(c) for c in df.columns],
+            y=[str(i) for i in df.index],
+            colorscale=colorscale,
+            zmid=zmid,
+            hovertemplate="단기 %{y} / 장기 %{x}<br>%{z:.2f}%<extra></extra>",
+        )]
+    )
+    fig.update_layout(
+        title=title,
+        xaxis_title="장기 이동평균(일)",
+        yaxis_title="단기 이동평균(일)",
+        margin=dict(l=10, r=10, t=50, b=10),
+    )
+    return fig
+
+
+names_text = st.text_area(
+    f"종목 (쉼표/줄바꿈 구분, 최대 {MAX_TICKERS}개)",
+    value=st.session_state.get("company_name", ""),
+    height=80,
+)
+
+today = datetime.date.today()
+c1, c2, c3 = st.columns(3)
+with c1:
+    selected_dates = st.date_input(
+        '백테스트 기간',
+        (datetime.date(today.year - 3, 1, 1), today),
+        format="MM.DD.YYYY",
+    )
+    cost_pct = st.number_input("매매 1회당 비용(%)", 0.0, 1.0, 0.1, step=0.05)
+with c2:
+    short_range = st.slider("단기 이동평균 범위(일)", 2, 60, (5, 30))
+    short_step = st.number_input("단기 간격", 1, 20, 1)
+with c3:
+    long_range = st.slider("장기 이동평균 범위(일)", 10, 250, (20, 200))
+    long_step = st.number_input("장기 간격", 1, 50, 5)
+
+run_btn = st.button("백테스트 실행")
+
+if run_btn:
+    queries = company.split_queries(names_text, MAX_TICKERS)
+    shorts = tuple(int(w) for w in np.arange(short_range[0], short_range[1] + 1, short_step))
+    longs = tuple(int(w) for w in np.arange(long_range[0], long_range[1] + 1, long_step))
+
+    if not queries or len(selected_dates) != 2:
+        st.warning("종목과 시작/종료 날짜를 선택해 주세요.")
+    else:
+        try:
+            codes, not_found = company.resolve_many(queries)
+            if not_found:
+                st.warning(f"찾을 수 없는 종목: {', '.join(not_found)}")
+
+            with st.spinner(f'{len(codes)}개 종목 데이터를 수집하는 중...'):
+                frames, errors = compare.fetch_many(list(codes), selected_dates[0], selected_dates[1])
+            for code, msg in errors.items():
+                st.warning(f"{codes[code]}({code}): {msg}")
+
+            if frames:
+                closes = {code: df["Close"] for code, df in frames.items()}
+                key = (tuple(sorted(closes)), selected_dates[0].isoformat(), selected_dates[1].isoformat())
+                with st.spinner(f'{len(shorts) * len(longs):,}개 조합을 계산하는 중...'):
+                    results = run_grid(key, shorts, longs, cost_pct / 100, closes)
+                st.session_state["backtest_result"] = {f"{codes[c]}({c})": r for c, r in results.items()}
+
+        except Exception as e:
+            st.error(f"오류가 발생했습니다: {e}")
+
+if "backtest_result" in st.session_state:
+    results = st.session_state["backtest_result"]
+    labels = list(results)
+    if len(results) > 1:
+        # 여러 종목이면 조합별 평균 성과를 먼저 보여준다
+        results = {"전체 평균": backtest.mean_result(list(results.values())), **results}
+        labels = list(results)
+
+    for tab, label in zip(st.tabs(labels), labels):
+        result = results[label]
+        with tab:
+            best = result.best()
+            if best is None:
+                st.info("기간이 짧아 계산할 수 있는 조합이 없습니다.")
+                continue
+            s, l = best
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("최고 조합", f"MA{s} / MA{l}")
+            m2.metric("누적 수익률", f"{result.total_return.loc[s, l]:.2f}%",
+                      f"보유 대비 {result.total_return.loc[s, l] - result.buy_hold:+.2f}%p")
+            m3.metric("최대낙폭(MDD)", f"{result.mdd.loc[s, l]:.2f}%")
+            m4.metric("매매 횟수", f"{result.trades.loc[s, l]:.0f}")
+
+            h1, h2 = st.columns(2)
+            with h1:
+                st.plotly_chart(heatmap(result.total_return, "누적 수익률(%)", "RdYlGn", zmid=0), use_container_width=True)
+            with h2:
+                st.plotly_chart(heatmap(result.mdd, "최대낙폭(%)", "Reds_r"), use_container_width=True)
+            st.caption(f"같은 기간 단순 보유 수익률: {result.buy_hold:.2f}% · 단기 ≥ 장기 조합은 비워둡니다.")
+
+perf.render_debug_panel()
+perf.end_run()
@@ -0,0 +1 @@
+# StockFlow 대시보드 공용 모듈 (데이터 저장소 / 지표 계산 등)
@@ -0,0 +1,111 @@
+# 이동평균 교차 전략 백테스트 (단기 MA > 장기 MA인 다음 날 보유, 아니면 현금)
+# - 필요한 모든 기간의 이동평균을 누적합으로 한 번에 (기간 × 날짜) 2차원 배열로 계산
+# - (단기 × 장기 × 날짜) 브로드캐스팅으로 신호/포지션/손익 행렬을 만들어 격자 전체를 한 번에 평가
+# - 메모리는 단기 기간 묶음 단위로 나눠 계산해 제한, 여러 종목은 프로세스 풀로 분산
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from stockflow import workers
+from stockflow.indicators import moving_averages
+
+# 한 번에 만드는 (단기 × 장기 × 날짜) 배열의 최대 원소 수
+CHUNK_ELEMENTS = 4_000_000
+MAX_WORKERS = workers.MAX_PROCESSES
+
+
+@dataclass(frozen=True)
+class GridResult:
+    total_return: pd.DataFrame  # 누적 수익률 (%), 행=단기, 열=장기. 단기 >= 장기 조합은 NaN
+    mdd: pd.DataFrame           # 최대낙폭 (%)
+    trades: pd.DataFrame        # 매매 횟수 (진입+청산)
+    buy_hold: float             # 같은 기간 보유 수익률 (%)
+
+    def best(self) -> tuple[int, int] | None:
+        if self.total_return.isna().all().all():
+            return None
+        return self.total_return.stack().idxmax()
+
+
+def grid_backtest(close: pd.Series, shorts, longs, cost: float = 0.0) -> GridResult:
+    shorts = np.asarray(sorted(set(shorts)), dtype=int)
+    longs = np.asarray(sorted(set(longs)), dtype=int)
+    values = close.dropna().to_numpy(dtype=np.float64)
+    n = len(values)
+
+    windows = np.union1d(shorts, longs)
+    # (기간 × 날짜) 이동평균 배열. 앞쪽 w-1개는 NaN
+    ma_by_window, _ = moving_averages(values, windows)
+    ma = np.stack([ma_by_window[w] for w in windows])
+    ma_short = ma[np.searchsorted(windows, shorts)]
+    ma_long = ma[np.searchsorted(windows, longs)]
+    valid_pair = shorts[:, None] < longs[None, :]
+
+    daily_ret = np.zeros(n)
+    if n >= 2:
+        daily_ret[1:] = values[1:] / values[:-1] - 1.0
+
+    total = np.full((len(shorts), len(longs)), np.nan)
+    mdd = np.full_like(total, np.nan)
+    trades = np.full_like(total, np.nan)
+
+    # 수익률을 계산할 수 없는 짧은 구간은 전부 NaN
+    chunk = max(1, CHUNK_ELEMENTS // max(1, len(longs) * n))
+    for lo in range(0, len(shorts) if n >= 2 else 0, chunk):
+        hi = min(lo + chunk, len(shorts))
+        # 신호: 단기 > 장기 (MA가 아직 없는 구간은 False). 포지션은 신호 다음 날부터
+        signal = ma_short[lo:hi, None, :] > ma_long[None, :, :]
+        position = np.zeros_like(signal)
+        position[..., 1:] = signal[..., :-1]
+
+        turnover = np.abs(np.diff(position, axis=-1, prepend=False).astype(np.int8))
+        strat_ret = position * daily_ret - turnover * cost
+        equity = np.cumprod(1.0 + strat_ret, axis=-1)
+        drawdown = equity / np.maximum.accumulate(equity, axis=-1) - 1.0
+
+        total[lo:hi] = (equity[..., -1] - 1.0) * 100
+        mdd[lo:hi] = drawdown.min(axis=-1) * 100
+        trades[lo:hi] = turnover.sum(axis=-1)
+
+    total[~valid_pair] = np.nan
+    mdd[~valid_pair] = np.nan
+    trades[~valid_pair] = np.nan
+
+    index = pd.Index(shorts, name="단기")
+    columns = pd.Index(longs, name="장기")
+    return GridResult(
+        total_return=pd.DataFrame(total, index=index, columns=columns),
+        mdd=pd.DataFrame(mdd, index=index, columns=columns),
+        trades=pd.DataFrame(trades, index=index, columns=columns),
+        buy_hold=(values[-1] / values[0] - 1.0) * 100 if n >= 2 else float("nan"),
+    )
+
+
+# 여러 종목 결과의 조합별 평균 (계산할 수 없던 종목/조합은 제외)
+def mean_result(results: list[GridResult]) -> GridResult:
+    def mean(frames):
+        return pd.concat(frames).groupby(level=0).mean().reindex(index=frames[0].index, columns=frames[0].columns)
+
+    return GridResult(
+        total_return=mean([r.total_return for r in results]),
+        mdd=mean([r.mdd for r in results]),
+        trades=mean([r.trades for r in results]),
+        buy_hold=float(np.nanmean([r.buy_hold for r in results])),
+    )
+
+
+def _run_one(task):
+    code, close, shorts, longs, cost = task
+    return code, grid_backtest(close, shorts, longs, cost)
+
+
+# 여러 종목을 프로세스 풀에서 나눠 계산 (종목이 하나면 현재 프로세스에서 바로 계산)
+def backtest_many(closes: dict[str, pd.Series], shorts, longs, cost: float = 0.0,
+                  max_workers: int = MAX_WORKERS) -> dict[str, GridResult]:
+    tasks = [(code, close, tuple(shorts), tuple(longs), cost) for code, close in closes.items()]
+    n_workers = min(max_workers, len(tasks))
+    if n_workers <= 1:
+        return dict(map(_run_one, tasks))
+    with workers.process_pool(n_workers) as pool:
+        return dict(pool.map(_run_one, tasks))
@@ -0,0 +1,68 @@
+# 차트용 데이터 축소
+# - 조회 기간이 길면 일봉 → 주봉 → 월봉으로 OHLCV를 리샘플링
+# - 라인 차트는 LTTB(Largest-Triangle-Three-Buckets)로 모양을 유지하며 점 개수를 줄인다
+import numpy as np
+import pandas as pd
+
+# 조회 기간(일)이 이 값을 넘으면 해당 주기로 리샘플링
+WEEKLY_AFTER_DAYS = 3 * 365
+MONTHLY_AFTER_DAYS = 15 * 365
+LINE_MAX_POINTS = 2000
+
+_OHLCV_AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def resample_ohlc(df: pd.DataFrame, rule: str) -> pd.DataFrame:
+    agg = {col: how for col, how in _OHLCV_AGG.items() if col in df.columns}
+    # 기간의 마지막 실제 거래일을 봉의 날짜로 사용
+    out = df.resample(rule).agg(agg)
+    last_dates = pd.Series(df.index, index=df.index).resample(rule).last()
+    out.index = pd.DatetimeIndex(last_dates.to_numpy())
+    return out.dropna(subset=["Close"])
+
+
+# 조회 기간 길이에 맞는 봉 주기로 변환 → (데이터, 주기 이름)
+def auto_resample(df: pd.DataFrame) -> tuple[pd.DataFrame, str]:
+    if len(df) < 2:
+        return df, "일봉"
+    span_days = (df.index[-1] - df.index[0]).days
+    if span_days > MONTHLY_AFTER_DAYS:
+        return resample_ohlc(df, "MS"), "월봉"
+    if span_days > WEEKLY_AFTER_DAYS:
+        return resample_ohlc(df, "W-FRI"), "주봉"
+    return df, "일봉"
+
+
+# LTTB 다운샘플링: 남길 점의 위치(정수 인덱스) 배열을 반환
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int = LINE_MAX_POINTS) -> np.ndarray:
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # 첫/마지막 점은 고정, 가운데를 threshold-2개 버킷으로 나눈다
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[prev] - avg_x) * (by - y[prev]) - (x[prev] - bx) * (avg_y - y[prev]))
+        prev = start + int(np.argmax(area))
+        selected[i + 1] = prev
+    return selected
+
+
+def downsample_line(series: pd.Series, threshold: int = LINE_MAX_POINTS) -> pd.Series:
+    series = series.dropna()
+    if len(series) <= threshold:
+        return series
+    x = series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else np.arange(len(series))
+    return series.iloc[lttb(x, series.to_numpy(), threshold)]
@@ -0,0 +1,235 @@
+# KRX 상장사 명단 캐시 + 회사명/종목코드 검색 인덱스
+# - KIND 명단을 data/krx_listing.parquet에 보관하고 TTL이 지나면 백그라운드에서 갱신
+# - 조회는 미리 만든 인덱스(정확 일치 dict / 접두어 트라이 / 정규화·유사도 매칭)로 처리
+import difflib
+from collections import Counter
+import re
+import threading
+import time
+import unicodedata
+
+import pandas as pd
+
+from stockflow import perf
+from stockflow import upstream
+from stockflow.config import DATA_DIR
+from stockflow.storage import write_atomic
+
+KIND_URL = 'http://kind.krx.co.kr/corpgeneral/corpList.do?method=download&searchType=13'
+LISTING_PATH = DATA_DIR / "krx_listing.parquet"
+LISTING_TTL = 24 * 60 * 60
+
+_state_lock = threading.Lock()
+_listing: pd.DataFrame | None = None
+_index: "CompanyIndex | None" = None
+_refreshing = False
+
+
+def _scrape() -> pd.DataFrame:
+    with perf.span("kind.scrape") as info:
+        df = upstream.call("kind", "listing", _scrape_listing)
+        info["rows"] = len(df)
+    return df
+
+
+def _scrape_listing() -> pd.DataFrame:
+    df_listing = pd.read_html(KIND_URL, header=0, flavor='bs4', encoding='EUC-KR')[0]
+    df_listing = df_listing[['회사명', '종목코드']].copy()
+    df_listing['종목코드'] = df_listing['종목코드'].apply(lambda x: f'{x:06}')
+    return df_listing
+
+
+def _save_listing(df: pd.DataFrame) -> None:
+    write_atomic(LISTING_PATH, lambda p: df.to_parquet(p, index=False))
+
+
+def _set_listing(df: pd.DataFrame) -> None:
+    global _listing, _index
+    index = CompanyIndex(df)
+    with _state_lock:
+        _listing, _index = df, index
+
+
+def _refresh_in_background() -> None:
+    global _refreshing
+    with _state_lock:
+        if _refreshing:
+            return
+        _refreshing = True
+
+    def run():
+        global _refreshing
+        try:
+            df = _scrape()
+            _save_listing(df)
+            _set_listing(df)
+        except Exception:
+            # 갱신 실패 시 기존(오래된) 명단을 계속 사용
+            pass
+        finally:
+            with _state_lock:
+                _refreshing = False
+
+    threading.Thread(target=run, name="krx-listing-refresh", daemon=True).start()
+
+
+def _is_stale() -> bool:
+    return time.time() - LISTING_PATH.stat().st_mtime > LISTING_TTL
+
+
+def _load_initial() -> None:
+    if _listing is not None:
+        return
+    if LISTING_PATH.exists():
+        perf.count("company.listing.disk")
+        _set_listing(pd.read_parquet(LISTING_PATH))
+    else:
+        perf.count("company.listing.miss")
+        df = _scrape()
+        _save_listing(df)
+        _set_listing(df)
+
+
+# 상장사 명단 (메모리 → 로컬 파일 → KIND 순서로 확인)
+def load_listing() -> pd.DataFrame:
+    if _listing is None:
+        # 콜드 스타트에 여러 세션이 동시에 들어와도 명단 적재는 한 번만
+        upstream.single_flight(("kind", "load"), _load_initial)
+    else:
+        perf.count("company.listing.hit")
+
+    if LISTING_PATH.exists() and _is_stale():
+        _refresh_in_background()
+    return _listing
+
+
+def get_index() -> "CompanyIndex":
+    load_listing()
+    return _index
+
+
+# 회사명 또는 종목코드(6자리) → 종목코드, 찾지 못하면 None
+def resolve_code(query: str) -> str | None:
+    query = query.strip()
+    if query.isdigit() and len(query) == 6:
+        return query
+    return get_index().lookup(query)
+
+
+# 쉼표/줄바꿈으로 구분한 종목 입력 → 중복을 뺀 검색어 목록 (최대 limit개)
+def split_queries(text: str, limit: int) -> list[str]:
+    queries = [q.strip() for q in re.split(r"[,\n]", text) if q.strip()]
+    return list(dict.fromkeys(queries))[:limit]
+
+
+# 여러 검색어 → ({종목코드: 회사명}, 찾지 못한 검색어). 같은 종목을 여러 번 입력하면 한 번만
+def resolve_many(queries) -> tuple[dict[str, str], list[str]]:
+    index = get_index()
+    codes, not_found = {}, []
+    for q in queries:
+        code = resolve_code(q)
+        if code is None:
+            not_found.append(q)
+        else:
+            codes.setdefault(code, index.by_code.get(code, q))
+    return codes, not_found
+
+
+# 회사명 정규화: 전각/반각 통일, 소문자, 공백 및 법인 표기 제거
+def normalize(name: str) -> str:
+    name = unicodedata.normalize("NFKC", str(name)).lower()
+    for token in ("(주)", "주식회사", "㈜"):
+        name = name.replace(token, "")
+    return "".join(name.split())
+
+
+def _bigrams(text: str) -> set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class _Trie:
+    # 각 노드에 후보를 최대 limit개까지 미리 담아 두어 접두어 조회가 O(len(prefix))
+    def __init__(self, limit: int = 20):
+        self.limit = limit
+        self.root: dict = {"_hits": []}
+
+    def insert(self, key: str, value) -> None:
+        node = self.root
+        for ch in key:
+            node = node.setdefault(ch, {"_hits": []})
+            if len(node["_hits"]) < self.limit:
+                node["_hits"].append(value)
+
+    def find(self, prefix: str) -> list:
+        node = self.root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        return node["_hits"]
+
+
+class CompanyIndex:
+    def __init__(self, listing: pd.DataFrame):
+        # 짧은 이름을 먼저 넣어 접두어 후보가 짧은(대표) 회사명부터 나오도록 정렬
+        listing = listing.assign(_len=listing['회사명'].str.len()).sort_values(['_len', '회사명'])
+        names = listing['회사명'].tolist()
+        codes = listing['종목코드'].tolist()
+
+        self.by_name: dict[str, str] = {}
+        self.by_code: dict[str, str] = {}
+        self.by_normalized: dict[str, str] = {}
+        self._name_trie = _Trie()
+        self._code_trie = _Trie()
+
+        for name, code in zip(names, codes):
+            self.by_name.setdefault(name, code)
+            self.by_code.setdefault(code, name)
+            norm = normalize(name)
+            if norm not in self.by_normalized:
+                self.by_normalized[norm] = code
+                self._name_trie.insert(norm, code)
+            self._code_trie.insert(code, code)
+
+        # 유사도 매칭 후보를 좁히기 위한 2-gram 역색인
+        self._bigrams: dict[str, list[str]] = {}
+        for norm in self.by_normalized:
+            for gram in _bigrams(norm):
+                self._bigrams.setdefault(gram, []).append(norm)
+
+    # 정확 일치(회사명/종목코드) → 정규화 일치 순으로 종목코드 반환, 없으면 None
+    def lookup(self, query: str) -> str | None:
+        query = query.strip()
+        if query in self.by_name:
+            return self.by_name[query]
+        if query in self.by_code:
+            return query
+        return self.by_normalized.get(normalize(query))
+
+    # 자동완성 후보 [(회사명, 종목코드), ...]: 접두어 일치 우선, 부족하면 유사도 매칭으로 채움
+    def suggest(self, query: str, limit: int = 10) -> list[tuple[str, str]]:
+        query = query.strip()
+        if not query:
+            return []
+
+        if query.isdigit():
+            codes = self._code_trie.find(query)[:limit]
+        else:
+            norm = normalize(query)
+            codes = list(self._name_trie.find(norm)[:limit])
+            if len(codes) < limit:
+                close = difflib.get_close_matches(norm, self._fuzzy_candidates(norm), n=limit, cutoff=0.6)
+                for key in close:
+                    code = self.by_normalized[key]
+                    if code not in codes:
+                        codes.append(code)
+                codes = codes[:limit]
+
+        return [(self.by_code[code], code) for code in codes]
+
+    # 질의와 2-gram을 많이 공유하는 회사명만 difflib 비교 대상으로 사용
+    def _fuzzy_candidates(self, norm: str, max_candidates: int = 50) -> list[str]:
+        shared = Counter()
+        for gram in _bigrams(norm):
+            shared.update(self._bigrams.get(gram, ()))
+        return [key for key, _ in shared.most_common(max_candidates)]
@@ -0,0 +1,60 @@
+# 여러 종목 비교: 병렬 수집 → 날짜 기준 2차원 배열 정렬 → 지표를 행렬 연산으로 일괄 계산
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from stockflow import datasets
+from stockflow import indicators
+
+MAX_WORKERS = 8
+
+
+def _iso(value) -> str:
+    return pd.Timestamp(value).date().isoformat()
+
+
+# 종목별 주가를 제한된 스레드 풀에서 동시에 수집. 실패한 종목은 errors에 사유를 담는다
+def fetch_many(stock_codes: list[str], start, end, max_workers: int = MAX_WORKERS):
+    frames: dict[str, pd.DataFrame] = {}
+    errors: dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="compare-fetch") as pool:
+        futures = {
+            code: pool.submit(datasets.get_prices, (code, _iso(start), _iso(end)))
+            for code in stock_codes
+        }
+        for code, future in futures.items():
+            try:
+                df = future.result()
+            except Exception as e:
+                errors[code] = str(e)
+                continue
+            if df.empty:
+                errors[code] = "해당 기간의 주가 데이터가 없습니다."
+            else:
+                frames[code] = df
+    return frames, errors
+
+
+# 종가를 (날짜 × 종목) 배열로 정렬. 거래일이 다른 종목은 직전 종가로 채우고 상장 전 구간은 NaN
+def align_closes(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    closes = pd.concat({code: df["Close"] for code, df in frames.items()}, axis=1).sort_index()
+    return closes.ffill().astype(np.float64)
+
+
+# 정규화 수익률(시작=100), 일간 수익률 상관계수, 종목별 기간수익률/MDD/변동성
+def matrix_metrics(closes: pd.DataFrame):
+    matrix = closes.to_numpy()
+    m = indicators.matrix_metrics(matrix)
+    normalized = matrix / m.first * 100
+
+    summary = pd.DataFrame(
+        {
+            "기간 수익률(%)": m.period_return,
+            "최대낙폭(%)": m.mdd,
+            "변동성(연환산, %)": m.vol_annual,
+        },
+        index=closes.columns,
+    )
+    corr = pd.DataFrame(m.daily_ret, columns=closes.columns).corr()
+    return pd.DataFrame(normalized, index=closes.index, columns=closes.columns), corr, summary
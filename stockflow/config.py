@@ -0,0 +1,12 @@
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# STOCKFLOW_* 설정을 읽는 모듈은 모두 이 모듈을 먼저 import하므로 .env도 여기서 불러온다
+# (페이지 스크립트든 python -m stockflow.* CLI든 import 순서와 상관없이 .env 설정이 적용되도록)
+ROOT_DIR = Path(__file__).resolve().parent.parent
+load_dotenv(ROOT_DIR / ".env")
+
+# 로컬 캐시/저장소 루트 (기본: 프로젝트 루트의 data/)
+DATA_DIR = Path(os.getenv("STOCKFLOW_DATA_DIR", ROOT_DIR / "data"))
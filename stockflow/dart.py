@@ -0,0 +1,221 @@
+# OpenDartReader 공용 인스턴스 + DART 기업코드(corp_code) 캐시/인덱스
+# - corp_codes(약 10만 건)는 data/dart_corp_codes.parquet에 보관하고 프로세스 전체에서 공유
+# - 종목코드 → corp_code, 회사명 → corp_code 인덱스로 선형 검색 없이 조회
+# - finstate 결과는 (corp_code, 연도, 보고서) 단위로 data/finstate/에 보관하고 스레드 풀로 미리 받아 둔다
+import datetime
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+
+from stockflow import perf
+from stockflow import upstream
+from stockflow.config import DATA_DIR
+from stockflow.storage import write_atomic
+
+CORP_CODES_PATH = DATA_DIR / "dart_corp_codes.parquet"
+CORP_CODES_TTL = 7 * 24 * 60 * 60
+FINSTATE_DIR = DATA_DIR / "finstate"
+# 아직 공시되지 않았을 수 있는 (빈) 결과는 이 시간이 지나면 다시 조회
+FINSTATE_EMPTY_TTL = 12 * 60 * 60
+REPORT_CODES = ["11011", "11012", "11013", "11014"]
+# 재무제표 화면 기본값 (전년도 사업보고서)
+DEFAULT_REPORT = "11011"
+
+_lock = threading.Lock()
+_readers: dict[str, object] = {}
+_corp_index: "CorpIndex | None" = None
+_finstate_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dart-finstate")
+_inflight: dict[tuple[str, int, str], Future] = {}
+
+
+# API 키별로 OpenDartReader를 한 번만 생성 (생성 시 corp_codes를 내려받기 때문에 비용이 큼)
+# 생성은 _lock 밖에서 해서 그동안 다른 세션의 finstate/corp_codes 조회를 막지 않는다
+def get_reader(api_key: str):
+    with _lock:
+        reader = _readers.get(api_key)
+    if reader is not None:
+        return reader
+    return upstream.single_flight(("dart", "reader", api_key), _create_reader, api_key)
+
+
+def _create_reader(api_key: str):
+    with _lock:
+        if api_key in _readers:
+            return _readers[api_key]
+    import OpenDartReader
+
+    with perf.span("dart.reader.init"):
+        reader = OpenDartReader(api_key)
+    with _lock:
+        return _readers.setdefault(api_key, reader)
+
+
+class CorpIndex:
+    def __init__(self, corp_codes: pd.DataFrame):
+        self.corp_codes = corp_codes
+        stock_codes = corp_codes["stock_code"].fillna("").astype(str).str.strip()
+        listed = stock_codes.str.fullmatch(r"[0-9A-Z]{6}")
+
+        self.by_stock_code: dict[str, str] = dict(zip(stock_codes[listed], corp_codes.loc[listed, "corp_code"]))
+        # 동명 법인이 여럿이면 상장사를 우선
+        self.by_name: dict[str, str] = {}
+        for name, code in zip(corp_codes.loc[listed, "corp_name"], corp_codes.loc[listed, "corp_code"]):
+            self.by_name.setdefault(name, code)
+        for name, code in zip(corp_codes["corp_name"], corp_codes["corp_code"]):
+            self.by_name.setdefault(name, code)
+
+    def resolve(self, stock_code: str | None = None, corp_name: str | None = None) -> str | None:
+        if stock_code and stock_code in self.by_stock_code:
+            return self.by_stock_code[stock_code]
+        if corp_name:
+            return self.by_name.get(corp_name)
+        return None
+
+
+def _save_corp_codes(df: pd.DataFrame) -> None:
+    write_atomic(CORP_CODES_PATH, lambda p: df.to_parquet(p, index=False))
+
+
+# corp_codes 인덱스 (메모리 → 로컬 파일 → DART 순서로 확인)
+def get_corp_index(api_key: str) -> CorpIndex:
+    if _corp_index is not None:
+        perf.count("dart.corp_codes.hit")
+        return _corp_index
+    # 동시에 여러 세션이 요청해도 corp_codes 적재는 한 번만
+    return upstream.single_flight(("dart", "corp_index"), _load_corp_index, api_key)
+
+
+def _load_corp_index(api_key: str) -> CorpIndex:
+    global _corp_index
+    if _corp_index is not None:
+        return _corp_index
+
+    if CORP_CODES_PATH.exists() and time.time() - CORP_CODES_PATH.stat().st_mtime < CORP_CODES_TTL:
+        perf.count("dart.corp_codes.disk")
+        corp_codes = pd.read_parquet(CORP_CODES_PATH)
+    else:
+        perf.count("dart.corp_codes.miss")
+        with perf.span("dart.corp_codes"):
+            corp_codes = upstream.call("dart", "corp_codes", lambda: get_reader(api_key).corp_codes)
+        if corp_codes is None or corp_codes.empty:
+            raise RuntimeError("DART 기업 목록(corp_codes)을 불러오지 못했습니다.")
+        corp_codes = corp_codes.astype(str)
+        _save_corp_codes(corp_codes)
+
+    index = CorpIndex(corp_codes)
+    with _lock:
+        _corp_index = index
+    return index
+
+
+def resolve_corp_code(api_key: str, stock_code: str | None = None, corp_name: str | None = None) -> str | None:
+    return get_corp_index(api_key).resolve(stock_code=stock_code, corp_name=corp_name)
+
+
+def _finstate_path(corp_code: str, year: int, reprt_code: str):
+    return FINSTATE_DIR / corp_code / f"{year}_{reprt_code}.parquet"
+
+
+# 저장된 finstate가 있으면 반환, 없거나 만료됐으면 None
+def _read_cached_finstate(corp_code: str, year: int, reprt_code: str) -> pd.DataFrame | None:
+    path = _finstate_path(corp_code, year, reprt_code)
+    if not path.exists():
+        return None
+    fs = pd.read_parquet(path)
+    # 데이터가 있는 보고서나 2년 이상 지난 연도는 확정된 기간이므로 만료 없음
+    closed_year = year <= datetime.date.today().year - 2
+    if fs.empty and not closed_year and time.time() - path.stat().st_mtime > FINSTATE_EMPTY_TTL:
+        return None
+    return fs
+
+
+def _fetch_finstate(api_key: str, corp_code: str, year: int, reprt_code: str) -> pd.DataFrame:
+    with perf.span("dart.finstate", corp_code=corp_code, year=year, reprt_code=reprt_code):
+        fs = upstream.call(
+            "dart", ("finstate", corp_code, year, reprt_code),
+            get_reader(api_key).finstate, corp=corp_code, bsns_year=year, reprt_code=reprt_code,
+        )
+    fs = pd.DataFrame() if fs is None else fs.astype(str)
+
+    write_atomic(_finstate_path(corp_code, year, reprt_code), lambda p: fs.to_parquet(p, index=False))
+    return fs
+
+
+# 같은 키의 요청이 이미 진행 중이면 그 결과를 기다리고, 아니면 풀에 새로 제출
+def _submit_finstate(api_key: str, corp_code: str, year: int, reprt_code: str) -> Future:
+    key = (corp_code, year, reprt_code)
+    with _lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = _finstate_pool.submit(_fetch_finstate, api_key, corp_code, year, reprt_code)
+            _inflight[key] = future
+            future.add_done_callback(lambda _f: _inflight.pop(key, None))
+    return future
+
+
+# 재무제표 조회 (로컬 캐시 → 진행 중인 프리페치 → DART 순서)
+def get_finstate(api_key: str, corp_code: str, year: int, reprt_code: str) -> pd.DataFrame:
+    year = int(year)
+    cached = _read_cached_finstate(corp_code, year, reprt_code)
+    if cached is not None:
+        perf.count("dart.finstate.hit")
+        return cached
+    perf.count("dart.finstate.miss")
+    with perf.span("dart.finstate.wait"):
+        return _submit_finstate(api_key, corp_code, year, reprt_code).result()
+
+
+def _shares_path(corp_code: str, year: int):
+    return FINSTATE_DIR / corp_code / f"shares_{year}.json"
+
+
+def _fetch_share_count(api_key: str, corp_code: str, year: int) -> int | None:
+    with perf.span("dart.report.shares", corp_code=corp_code, year=year):
+        df = upstream.call(
+            "dart", ("shares", corp_code, year),
+            get_reader(api_key).report, corp_code, "주식총수", year, reprt_code=DEFAULT_REPORT,
+        )
+    if df is None or df.empty or "istc_totqy" not in df.columns:
+        return None
+    rows = df[df["se"].astype(str).str.strip() == "합계"] if "se" in df.columns else df
+    values = pd.to_numeric(rows["istc_totqy"].astype(str).str.replace(",", "", regex=False), errors="coerce").dropna()
+    return int(values.iloc[0]) if len(values) else None
+
+
+# 사업보고서 기준 발행주식 총수 (data/finstate/<corp>/shares_<연도>.json에 보관, 없던 결과는 FINSTATE_EMPTY_TTL 후 재조회)
+def get_share_count(api_key: str, corp_code: str, year: int) -> int | None:
+    path = _shares_path(corp_code, int(year))
+    if path.exists():
+        shares = json.loads(path.read_text(encoding="utf-8"))["shares"]
+        if shares is not None or time.time() - path.stat().st_mtime < FINSTATE_EMPTY_TTL:
+            perf.count("dart.shares.hit")
+            return shares
+    perf.count("dart.shares.miss")
+    # 여러 세션이 같은 회사를 처음 열어도 조회/저장은 한 번만
+    return upstream.single_flight(("dart", "shares", corp_code, int(year)), _load_share_count, api_key, corp_code, int(year))
+
+
+def _load_share_count(api_key: str, corp_code: str, year: int) -> int | None:
+    shares = _fetch_share_count(api_key, corp_code, year)
+    text = json.dumps({"shares": shares})
+    write_atomic(_shares_path(corp_code, year), lambda p: p.write_text(text, encoding="utf-8"))
+    return shares
+
+
+# 재무제표 화면에서 고를 수 있는 연도 (올해부터 3년 전까지). 기본 선택은 두 번째(전년도)
+def recent_years(today: datetime.date | None = None) -> list[int]:
+    year = (today or datetime.date.today()).year
+    return [year, year - 1, year - 2, year - 3]
+
+
+# 여러 연도 × 보고서 조합을 스레드 풀에서 병렬로 미리 받아 둔다 (캐시에 없는 것만)
+def prefetch_finstates(api_key: str, corp_code: str, years, reprt_codes=REPORT_CODES) -> list[Future]:
+    futures = []
+    for year in years:
+        for reprt_code in reprt_codes:
+            if _read_cached_finstate(corp_code, int(year), reprt_code) is None:
+                futures.append(_submit_finstate(api_key, corp_code, int(year), reprt_code))
+    return futures
@@ -0,0 +1,125 @@
+# 프로세스 전체가 공유하는 주가 데이터셋 캐시
+# - (종목코드, 시작일, 종료일) 키 → 읽기 전용 DataFrame (세션에는 키만 저장)
+# - 가격은 float32, 거래량은 uint32(범위 초과 시 int64)로 줄여서 보관
+# - 전체 메모리 예산(STOCKFLOW_DATASET_BUDGET_MB)을 넘으면 가장 오래 안 쓴 항목부터 제거(LRU)
+# - 종료일이 오늘 이후인 구간은 장중 봉이 계속 바뀌므로 OPEN_RANGE_TTL초가 지나면
+#   기존 데이터를 그대로 돌려주고 백그라운드에서 다시 불러온다 (실패하면 기존 데이터 유지)
+# 반환된 DataFrame은 여러 세션이 함께 쓰므로 수정하지 말 것 (파생 컬럼은 indicators 캐시 사용)
+import datetime
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from stockflow import perf
+from stockflow import upstream
+from stockflow.price_store import load_prices
+from stockflow.price_store import load_stored
+
+BUDGET_BYTES = int(float(os.getenv("STOCKFLOW_DATASET_BUDGET_MB", "256")) * 1024 * 1024)
+OPEN_RANGE_TTL = 60
+
+_PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Change")
+
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="datasets-refresh")
+_lock = threading.Lock()
+_cache: "OrderedDict[tuple, tuple[pd.DataFrame, int, float | None]]" = OrderedDict()  # 키 → (데이터, 크기, 만료 시각)
+_total_bytes = 0
+
+
+def compact(df: pd.DataFrame) -> pd.DataFrame:
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if col in _PRICE_COLUMNS:
+            values = values.astype(np.float32)
+        elif col == "Volume" and not pd.isna(values).any():
+            max_volume = values.max() if len(values) else 0
+            values = values.astype(np.uint32 if 0 <= max_volume < 2**32 else np.int64)
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+# 과거 구간은 만료 없음, 오늘이 포함된 구간은 OPEN_RANGE_TTL 뒤 만료
+def _expires_at(key: tuple) -> float | None:
+    if key[2] >= datetime.date.today().isoformat():
+        return time.monotonic() + OPEN_RANGE_TTL
+    return None
+
+
+def _put(key: tuple, df: pd.DataFrame) -> None:
+    global _total_bytes
+    nbytes = int(df.memory_usage(index=True, deep=True).sum())
+    with _lock:
+        if key in _cache:
+            _total_bytes -= _cache.pop(key)[1]
+        _cache[key] = (df, nbytes, _expires_at(key))
+        _total_bytes += nbytes
+        while _total_bytes > BUDGET_BYTES and len(_cache) > 1:
+            _, (_, evicted, _) = _cache.popitem(last=False)
+            _total_bytes -= evicted
+            perf.count("datasets.evict")
+
+
+# key=(종목코드, 시작일, 종료일) 데이터셋 반환 (메모리 → 로컬 저장소/네트워크 순서)
+def get_prices(key: tuple) -> pd.DataFrame:
+    expired = False
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None:
+            _cache.move_to_end(key)
+            if hit[2] is not None and time.monotonic() >= hit[2]:
+                # 장중 구간 만료 → 갱신이 한 번만 예약되도록 만료 시각을 먼저 미뤄 둔다
+                _cache[key] = (hit[0], hit[1], _expires_at(key))
+                expired = True
+    if expired:
+        perf.count("datasets.expired")
+        _refresh_pool.submit(_refresh, key)
+    if hit is not None:
+        perf.count("datasets.hit")
+        return hit[0]
+
+    perf.count("datasets.miss")
+    # 같은 키를 동시에 요청한 세션들은 첫 요청의 적재 결과를 함께 쓴다
+    # (종목별 잠금 안에서 차례로 오늘 봉을 다시 받지 않도록)
+    return upstream.single_flight(("datasets", key), _load, key)
+
+
+def _load(key: tuple) -> pd.DataFrame:
+    stock_code, start, end = key
+    df = load_prices(stock_code, start, end)
+    if df.empty:
+        return df
+    df = compact(df)
+    _put(key, df)
+    return df
+
+
+# 만료된 장중 구간을 다시 불러온다 (로컬 저장소 + 오늘 봉). 실패하면 다음 만료 때 다시 시도
+def _refresh(key: tuple) -> None:
+    try:
+        upstream.single_flight(("datasets", key), _load, key)
+    except Exception:
+        perf.count("datasets.refresh.error")
+
+
+# 로컬 저장소에 구간이 모두 있으면 네트워크 없이 캐시에 올린다 (예열용). 올렸으면 True
+def preload(key: tuple) -> bool:
+    with _lock:
+        if key in _cache:
+            return True
+    stock_code, start, end = key
+    df = load_stored(stock_code, start, end)
+    if df is None or df.empty:
+        return False
+    _put(key, compact(df))
+    return True
+
+
+def stats() -> dict:
+    with _lock:
+        return {"entries": len(_cache), "bytes": _total_bytes, "budget_bytes": BUDGET_BYTES}
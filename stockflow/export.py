@@ -0,0 +1,79 @@
+# 주가 데이터 내보내기 (다운로드 버튼을 눌렀을 때만 생성, 내용 해시 기준으로 캐시)
+import hashlib
+from io import BytesIO
+
+import pandas as pd
+import streamlit as st
+
+from stockflow import perf
+
+# 형식 이름 → (확장자, MIME)
+FORMATS = {
+    "엑셀(xlsx)": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "엑셀(xlsx, 대용량)": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    h = hashlib.sha1(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    h.update("|".join(map(str, df.columns)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _to_xlsx(df: pd.DataFrame) -> bytes:
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=True, sheet_name='Sheet1')
+    return output.getvalue()
+
+
+# openpyxl write_only 모드: 셀 객체를 메모리에 쌓지 않고 행 단위로 기록
+def _to_xlsx_streaming(df: pd.DataFrame) -> bytes:
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet1')
+    ws.append([df.index.name or "Date", *map(str, df.columns)])
+    index = df.index.to_pydatetime() if isinstance(df.index, pd.DatetimeIndex) else df.index
+    for idx, row in zip(index, df.itertuples(index=False, name=None)):
+        ws.append([idx, *(None if pd.isna(v) else v for v in row)])
+    output = BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+
+def _to_csv(df: pd.DataFrame) -> bytes:
+    # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+    return df.to_csv(index=True).encode("utf-8-sig")
+
+
+def _to_parquet(df: pd.DataFrame) -> bytes:
+    output = BytesIO()
+    df.to_parquet(output, index=True)
+    return output.getvalue()
+
+
+_BUILDERS = {
+    "엑셀(xlsx)": _to_xlsx,
+    "엑셀(xlsx, 대용량)": _to_xlsx_streaming,
+    "CSV": _to_csv,
+    "Parquet": _to_parquet,
+}
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_bytes(content_hash: str, fmt: str, _df: pd.DataFrame) -> bytes:
+    perf.count("export.miss")
+    with perf.span("export.build", fmt=fmt, rows=len(_df)) as info:
+        data = _BUILDERS[fmt](_df)
+        info["bytes"] = len(data)
+    return data
+
+
+def export_bytes(df: pd.DataFrame, fmt: str) -> bytes:
+    perf.count("export.call")
+    data = _cached_bytes(frame_hash(df), fmt, df)
+    perf.payload("export", len(data))
+    return data
@@ -0,0 +1,194 @@
+# 재무 팩트 저장소 (DART finstate → 정규화된 long 포맷)
+# - 행 하나 = (corp_code, year, report, fs_div, sj_div, account, amount), 금액은 수집 시 한 번만 숫자로 변환
+# - 회사별 data/facts/<corp_code>.parquet에 (fs_div, account, year, report) 순으로 정렬해 보관
+#   → 여러 연도 비교는 파일을 읽어 피벗만 하면 되고 rerun마다 문자열 처리를 하지 않는다
+# - 어떤 (연도, 보고서)를 어떤 finstate 파일 버전에서 적재했는지 <corp_code>.json에 기록해 바뀐 것만 다시 적재
+# - PER/PBR/ROE/부채비율은 사업보고서(11011) 팩트와 저장된 주가(연말 종가), 발행주식 총수를 결합해 계산
+import datetime
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from stockflow import dart
+from stockflow import datasets
+from stockflow import perf
+from stockflow.config import DATA_DIR
+from stockflow.indicators import data_fingerprint
+from stockflow.storage import write_atomic
+
+FACTS_DIR = DATA_DIR / "facts"
+COLUMNS = ["corp_code", "year", "report", "fs_div", "sj_div", "account", "amount"]
+KEY_ACCOUNTS = ["매출액", "영업이익", "당기순이익", "자산총계", "부채총계", "자본총계"]
+
+_lock = threading.Lock()
+_frames: dict[str, tuple[str, pd.DataFrame]] = {}  # corp_code → (버전, 팩트)
+_corp_locks: dict[str, threading.Lock] = {}
+
+
+def _paths(corp_code: str):
+    return FACTS_DIR / f"{corp_code}.parquet", FACTS_DIR / f"{corp_code}.json"
+
+
+# 같은 회사의 적재/저장은 한 번에 하나씩 (여러 세션이 동시에 처음 열어도 파일/메타가 섞이지 않도록)
+def _lock_for(corp_code: str) -> threading.Lock:
+    with _lock:
+        return _corp_locks.setdefault(corp_code, threading.Lock())
+
+
+# 계정명 정규화: 공백 제거, "(손실)" 등 표기 차이 통일
+def normalize_account(name: pd.Series) -> pd.Series:
+    return name.astype(str).str.replace(r"\s+", "", regex=True).str.replace(r"\(손실\)$", "", regex=True)
+
+
+def parse_amount(values: pd.Series) -> pd.Series:
+    cleaned = values.astype(str).str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(cleaned.where(~cleaned.isin(["", "-", "None", "nan"])), errors="coerce")
+
+
+# finstate 원본 → 팩트 행 (당기 금액만 사용)
+def to_facts(fs: pd.DataFrame, corp_code: str, year: int, reprt_code: str) -> pd.DataFrame:
+    if fs is None or fs.empty or "account_nm" not in fs.columns:
+        return pd.DataFrame(columns=COLUMNS)
+    facts = pd.DataFrame({
+        "corp_code": corp_code,
+        "year": int(year),
+        "report": reprt_code,
+        "fs_div": fs["fs_div"].astype(str) if "fs_div" in fs.columns else "OFS",
+        "sj_div": fs["sj_div"].astype(str) if "sj_div" in fs.columns else "",
+        "account": normalize_account(fs["account_nm"]),
+        "amount": parse_amount(fs["thstrm_amount"]) if "thstrm_amount" in fs.columns else np.nan,
+    })
+    return facts.dropna(subset=["amount"]).drop_duplicates(["fs_div", "sj_div", "account"])
+
+
+def _read(corp_code: str) -> tuple[pd.DataFrame, dict]:
+    data_path, meta_path = _paths(corp_code)
+    if not data_path.exists() or not meta_path.exists():
+        return pd.DataFrame(columns=COLUMNS), {}
+    return pd.read_parquet(data_path), json.loads(meta_path.read_text(encoding="utf-8"))
+
+
+def _finstate_version(corp_code: str, year: int, reprt_code: str) -> float | None:
+    path = dart._finstate_path(corp_code, year, reprt_code)
+    return path.stat().st_mtime if path.exists() else None
+
+
+# (연도 × 보고서) 팩트를 반환. 아직 적재하지 않았거나 finstate 파일이 바뀐 조합만 DART 캐시에서 읽어 적재
+def load_facts(api_key: str, corp_code: str, years, reprt_codes=dart.REPORT_CODES) -> pd.DataFrame:
+    with _lock_for(corp_code):
+        facts = _load_facts_locked(api_key, corp_code, years, reprt_codes)
+    wanted = facts["year"].isin([int(y) for y in years]) & facts["report"].isin(list(reprt_codes))
+    return facts[wanted]
+
+
+def _load_facts_locked(api_key: str, corp_code: str, years, reprt_codes) -> pd.DataFrame:
+    with _lock:
+        cached = _frames.get(corp_code)
+    facts, meta = (cached[1], json.loads(cached[0])) if cached else _read(corp_code)
+
+    stale = []
+    for year in years:
+        for reprt_code in reprt_codes:
+            key = f"{int(year)}_{reprt_code}"
+            recorded = meta.get(key)
+            # 빈 결과는 dart 쪽 만료 규칙에 따라 다시 확인해야 하므로 항상 재확인
+            if recorded is None or recorded["rows"] == 0 or recorded["version"] != _finstate_version(corp_code, int(year), reprt_code):
+                stale.append((int(year), reprt_code))
+
+    perf.count("facts.hit" if not stale else "facts.miss")
+    changed = False
+    for year, reprt_code in stale:
+        fs = dart.get_finstate(api_key, corp_code, year, reprt_code)
+        version = _finstate_version(corp_code, year, reprt_code)
+        key = f"{year}_{reprt_code}"
+        if meta.get(key, {}).get("version") == version and key in meta:
+            continue
+        with perf.span("facts.ingest", year=year, reprt_code=reprt_code):
+            rows = to_facts(fs, corp_code, year, reprt_code)
+            facts = pd.concat(
+                [facts[~((facts["year"] == year) & (facts["report"] == reprt_code))], rows],
+                ignore_index=True,
+            )
+        meta[key] = {"version": version, "rows": len(rows)}
+        changed = True
+
+    if changed:
+        facts = facts.astype({"year": "int16", "amount": "float64"})
+        facts = facts.sort_values(["fs_div", "account", "year", "report"], ignore_index=True)
+        data_path, meta_path = _paths(corp_code)
+        write_atomic(data_path, lambda p: facts.to_parquet(p, index=False))
+        meta_text = json.dumps(meta, sort_keys=True)
+        write_atomic(meta_path, lambda p: p.write_text(meta_text, encoding="utf-8"))
+    with _lock:
+        _frames[corp_code] = (json.dumps(meta, sort_keys=True), facts)
+    return facts
+
+
+# 계정 × 연도 피벗 (재무제표 종류/보고서 하나 기준)
+def pivot(facts: pd.DataFrame, fs_div: str, reprt_code: str, accounts=None) -> pd.DataFrame:
+    rows = facts[(facts["fs_div"] == fs_div) & (facts["report"] == reprt_code)]
+    if accounts is not None:
+        rows = rows[rows["account"].isin(accounts)]
+    table = rows.pivot_table(index="account", columns="year", values="amount", aggfunc="first", sort=False)
+    if accounts is not None:
+        table = table.reindex([a for a in accounts if a in table.index])
+    return table.sort_index(axis=1)
+
+
+# 연도별 말일(또는 가장 최근) 종가
+def _year_end_closes(close: pd.Series, years) -> pd.Series:
+    close = close.dropna()
+    out = {}
+    for year in years:
+        upto = close[close.index <= pd.Timestamp(int(year), 12, 31)]
+        if len(upto) and upto.index[-1].year == int(year):
+            out[int(year)] = float(upto.iloc[-1])
+    return pd.Series(out, dtype=np.float64)
+
+
+def compute_ratios(annual: pd.DataFrame, close: pd.Series, shares: dict[int, int | None]) -> pd.DataFrame:
+    years = list(annual.columns)
+    get = lambda account: annual.loc[account] if account in annual.index else pd.Series(np.nan, index=years)
+    net_income, equity, liabilities = get("당기순이익"), get("자본총계"), get("부채총계")
+    price = _year_end_closes(close, years).reindex(years)
+    share_count = pd.Series({y: shares.get(y) for y in years}, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eps = net_income / share_count
+        bps = equity / share_count
+        ratios = pd.DataFrame({
+            "연말 종가": price,
+            "EPS": eps,
+            "BPS": bps,
+            "PER": price / eps.where(eps > 0),
+            "PBR": price / bps.where(bps > 0),
+            "ROE(%)": net_income / equity.where(equity > 0) * 100,
+            "부채비율(%)": liabilities / equity.where(equity > 0) * 100,
+        })
+    ratios.index.name = "연도"
+    return ratios
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached_ratios(corp_code, fs_div, facts_version, price_fingerprint, shares_items, _annual, _close) -> pd.DataFrame:
+    perf.count("facts.ratios.miss")
+    return compute_ratios(_annual, _close, dict(shares_items))
+
+
+# 사업보고서 팩트 + 저장된 주가로 연도별 밸류에이션 지표 계산 (팩트/주가가 바뀌지 않으면 캐시 재사용)
+def valuation_ratios(api_key: str, corp_code: str, stock_code: str, facts: pd.DataFrame, fs_div: str) -> pd.DataFrame:
+    annual = pivot(facts, fs_div, dart.DEFAULT_REPORT, ["당기순이익", "자본총계", "부채총계"])
+    years = [int(y) for y in annual.columns]
+    if not years:
+        return pd.DataFrame()
+
+    today = datetime.date.today()
+    prices = datasets.get_prices((stock_code, f"{min(years)}-01-01", today.isoformat()))
+    close = prices["Close"] if "Close" in prices.columns else pd.Series(dtype=np.float64)
+    shares = tuple((y, dart.get_share_count(api_key, corp_code, y)) for y in years)
+    with _lock:
+        version = _frames.get(corp_code, ("", None))[0]
+    return _cached_ratios(corp_code, fs_div, version, data_fingerprint(close), shares, annual, close)
@@ -0,0 +1,171 @@
+# 주가 지표 계산 (메인/부가지표 페이지 공용, 종가 행렬 지표는 종목비교/스크리너 공용)
+# - 종가 배열 한 번의 NumPy 패스로 이동평균(누적합), 낙폭, 변동성, 상승 비율을 계산
+# - 결과는 (종목, 기간, 파라미터) 단위로 메모이즈해서 두 페이지가 같이 쓴다
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from stockflow import perf
+
+MA_WINDOWS = (5, 20, 60, 120)
+UP_LOOKBACK = 60
+TRADING_DAYS = 252
+
+
+@dataclass(frozen=True)
+class Indicators:
+    index: pd.DatetimeIndex
+    close: np.ndarray
+    ma: dict[int, np.ndarray]          # rolling(n).mean()과 동일 (앞쪽 n-1개는 NaN)
+    ma_partial: dict[int, np.ndarray]  # rolling(n, min_periods=1).mean()과 동일
+    drawdown: np.ndarray               # 고점 대비 낙폭 (0 ~ -1)
+    period_return: float               # 기간 수익률 (%)
+    mdd: float                         # 최대낙폭 (%)
+    vol_annual: float                  # 연환산 변동성 (%)
+    up_prob: float                     # 최근 up_lookback일 중 상승일 비율 (%)
+
+    def ma_series(self, window: int, partial: bool = False) -> pd.Series:
+        values = self.ma_partial[window] if partial else self.ma[window]
+        return pd.Series(values, index=self.index, name=f"MA{window}")
+
+
+# (날짜 × 종목) 종가 행렬의 종목별 기간 지표 (종목비교/스크리너 공용)
+@dataclass(frozen=True)
+class MatrixMetrics:
+    first: np.ndarray          # 첫 유효 종가
+    last: np.ndarray           # 마지막 유효 종가
+    daily_ret: np.ndarray      # 일간 수익률 ((날짜 - 1) × 종목), 앞뒤 중 하루라도 값이 없으면 NaN
+    period_return: np.ndarray  # 기간 수익률 (%)
+    mdd: np.ndarray            # 최대낙폭 (%)
+    vol_annual: np.ndarray     # 연환산 변동성 (%), 수익률이 2개 미만이면 NaN
+    trading_days: np.ndarray   # 값이 있는 날 수
+
+
+def _last_valid_index(valid: np.ndarray) -> np.ndarray:
+    return valid.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+
+
+# NaN(상장 전/거래 없는 날)은 직전 종가로 채워 낙폭을 구하고 일간 수익률에서는 뺀다
+def matrix_metrics(matrix: np.ndarray) -> MatrixMetrics:
+    n_days, n_tickers = matrix.shape
+    valid = ~np.isnan(matrix)
+    if n_days == 0:
+        nan = np.full(n_tickers, np.nan)
+        return MatrixMetrics(nan, nan, np.empty((0, n_tickers)), nan, nan, nan, np.zeros(n_tickers, dtype=np.int64))
+
+    cols = np.arange(n_tickers)
+    first = matrix[np.argmax(valid, axis=0), cols]
+    last = matrix[_last_valid_index(valid), cols]
+    filled = pd.DataFrame(matrix).ffill().to_numpy()
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        drawdown = filled / np.fmax.accumulate(filled, axis=0) - 1.0
+        daily_ret = filled[1:] / filled[:-1] - 1.0
+        daily_ret[~valid[1:] | ~valid[:-1]] = np.nan
+
+        enough = (~np.isnan(daily_ret)).sum(axis=0) > 1
+        vol = np.full(n_tickers, np.nan)
+        vol[enough] = np.nanstd(daily_ret[:, enough], axis=0, ddof=1) * np.sqrt(TRADING_DAYS) * 100
+
+        return MatrixMetrics(
+            first=first,
+            last=last,
+            daily_ret=daily_ret,
+            period_return=(last / first - 1.0) * 100,
+            mdd=np.fmin.reduce(drawdown, axis=0) * 100,
+            vol_annual=vol,
+            trading_days=valid.sum(axis=0),
+        )
+
+
+# 누적합으로 여러 기간의 이동평균을 한 번에 계산
+def moving_averages(close: np.ndarray, windows=MA_WINDOWS) -> tuple[dict[int, np.ndarray], dict[int, np.ndarray]]:
+    n = len(close)
+    csum = np.concatenate(([0.0], np.cumsum(close, dtype=np.float64)))
+    counts = np.arange(1, n + 1, dtype=np.float64)
+
+    full, partial = {}, {}
+    for w in windows:
+        lagged = np.concatenate((np.zeros(min(w, n)), csum[1:n - w + 1])) if n > w else np.zeros(n)
+        sums = csum[1:] - lagged
+        partial[w] = sums / np.minimum(counts, w)
+        strict = sums / w
+        strict[:w - 1] = np.nan
+        full[w] = strict
+    return full, partial
+
+
+# 두 선의 부호가 바뀐 위치(교차 지점) 인덱스. 0(맞닿음)을 거치는 경우는 교차로 보지 않는다
+def cross_points(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    sign = np.sign(a - b)
+    prev, cur = sign[:-1], sign[1:]
+    crossed = (cur != prev) & (cur != 0) & (prev != 0) & ~np.isnan(cur) & ~np.isnan(prev)
+    return np.flatnonzero(crossed) + 1
+
+
+# 최근 lookback 구간에서 마지막 골든/데드크로스 (방향, 날짜)
+def last_cross(ind: Indicators, short: int, long: int, lookback: int = 60, partial: bool = True):
+    ma = ind.ma_partial if partial else ind.ma
+    a, b = ma[short], ma[long]
+    valid = ~(np.isnan(a) | np.isnan(b))
+    a, b, dates = a[valid][-lookback:], b[valid][-lookback:], ind.index[valid][-lookback:]
+    if len(a) < 3:
+        return None, None
+
+    points = cross_points(a, b)
+    if len(points) == 0:
+        return None, None
+    last = points[-1]
+    direction = "골든크로스" if a[last] > b[last] else "데드크로스"
+    return direction, dates[last]
+
+
+def compute(close: pd.Series, windows=MA_WINDOWS, up_lookback: int = UP_LOOKBACK) -> Indicators:
+    close = close.dropna()
+    values = close.to_numpy(dtype=np.float64)
+    ma, ma_partial = moving_averages(values, windows)
+
+    if len(values) >= 2:
+        drawdown = values / np.maximum.accumulate(values) - 1.0
+        daily_ret = values[1:] / values[:-1] - 1.0
+        period_return = (values[-1] / values[0] - 1.0) * 100
+        mdd = float(drawdown.min() * 100)
+        vol_annual = float(daily_ret.std(ddof=1) * np.sqrt(TRADING_DAYS) * 100) if len(daily_ret) > 1 else 0.0
+        up_prob = float((daily_ret[-up_lookback:] > 0).mean() * 100)
+    else:
+        drawdown = np.zeros(len(values))
+        period_return = mdd = vol_annual = up_prob = float("nan")
+
+    return Indicators(
+        index=close.index,
+        close=values,
+        ma=ma,
+        ma_partial=ma_partial,
+        drawdown=drawdown,
+        period_return=period_return,
+        mdd=mdd,
+        vol_annual=vol_annual,
+        up_prob=up_prob,
+    )
+
+
+# 캐시 키에 함께 넣는 데이터 지문 (길이, 마지막 날짜, 마지막 값). 같은 키라도 데이터가 갱신되면 바뀐다
+def data_fingerprint(series: pd.Series | None) -> tuple | None:
+    if series is None or series.empty:
+        return None
+    return len(series), str(series.index[-1]), float(series.iloc[-1])
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached(key, fingerprint, windows, up_lookback, _close: pd.Series) -> Indicators:
+    perf.count("indicators.miss")
+    with perf.span("indicators.compute", bars=len(_close)):
+        return compute(_close, windows, up_lookback)
+
+
+# key=(종목코드, 시작일, 종료일). 같은 키라도 데이터가 갱신됐으면(길이/마지막 봉) 다시 계산
+def get_indicators(key, close: pd.Series, windows=MA_WINDOWS, up_lookback: int = UP_LOOKBACK) -> Indicators:
+    perf.count("indicators.call")
+    return _cached(key, data_fingerprint(close), tuple(windows), up_lookback, close)
@@ -0,0 +1,195 @@
+# 장중 실시간 갱신: 새 봉이 들어올 때마다 지표를 전체 재계산 없이 O(1)로 갱신
+# - 이동평균: 기간별 링 버퍼(deque) + 누적합, 낙폭: 누적 최고가/최대낙폭
+# - 변동성: 일간 수익률의 Welford 온라인 평균/분산, 상승일 비율: 최근 N개 수익률 링 버퍼 + 상승 개수
+# - 마지막 봉(오늘)은 장중에 계속 바뀌므로 확정하지 않고 미리보기로만 반영, 날짜가 바뀌면 확정
+# - 트래커는 (종목, 시작일, 종료일) 키로 프로세스 전체가 공유 → 여러 세션이 같은 종목을 봐도 폴링은 한 번
+import datetime
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from stockflow import perf
+from stockflow import upstream
+from stockflow.indicators import MA_WINDOWS, TRADING_DAYS, UP_LOOKBACK
+
+POLL_INTERVAL = 30  # 초. 이 간격 안의 요청은 마지막 폴링 결과를 그대로 쓴다
+MAX_TICKS = 500     # 장중 가격 기록(차트용) 최대 개수
+MAX_TRACKERS = 256  # 넘으면 가장 먼저 만든 트래커부터 제거
+KST = ZoneInfo("Asia/Seoul")
+MARKET_OPEN = datetime.time(9, 0)
+# 장 마감(15:30) 후 종가 확정까지 여유를 둔다
+MARKET_CLOSE = datetime.time(15, 50)
+
+
+def market_open(now: datetime.datetime | None = None) -> bool:
+    now = now or datetime.datetime.now(KST)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() <= MARKET_CLOSE
+
+
+@dataclass
+class _Step:
+    sums: dict[int, float]
+    count: int
+    mean: float
+    m2: float
+    up_count: int
+    run_max: float
+    mdd: float
+    ret: float | None
+
+
+class LiveIndicators:
+    def __init__(self, close: pd.Series, windows=MA_WINDOWS, up_lookback: int = UP_LOOKBACK):
+        close = close.dropna()
+        values = close.to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            raise ValueError("지표를 계산할 종가가 없습니다.")
+
+        # 마지막 봉은 미확정으로 두고 그 앞까지로 상태를 초기화 (초기화만 O(n), 이후 봉마다 O(1))
+        committed, pending = values[:-1], float(values[-1])
+        self.windows = tuple(windows)
+        self.first = float(values[0])
+        self.buffers = {w: deque(committed[-w:].tolist(), maxlen=w) for w in self.windows}
+        self.sums = {w: float(sum(buf)) for w, buf in self.buffers.items()}
+        self.last_committed = float(committed[-1]) if len(committed) else None
+
+        rets = committed[1:] / committed[:-1] - 1.0 if len(committed) >= 2 else np.empty(0)
+        self.count = len(rets)
+        self.mean = float(rets.mean()) if self.count else 0.0
+        self.m2 = float(((rets - self.mean) ** 2).sum()) if self.count else 0.0
+        self.ups = deque((rets[-up_lookback:] > 0).tolist(), maxlen=up_lookback)
+        self.up_count = sum(self.ups)
+
+        self.run_max = float(committed.max()) if len(committed) else -math.inf
+        self.mdd = float((committed / np.maximum.accumulate(committed) - 1.0).min()) if len(committed) else 0.0
+
+        self.pending_date = close.index[-1]
+        self.pending = pending
+        self.ticks: deque = deque(maxlen=MAX_TICKS)
+        self.last_poll = 0.0
+        self.poll_lock = threading.Lock()
+        self.state_lock = threading.Lock()
+
+    # 종가 price를 한 봉 추가했을 때의 상태 (상태는 바꾸지 않음)
+    def _step(self, price: float) -> _Step:
+        sums = {}
+        for w, buf in self.buffers.items():
+            evicted = buf[0] if len(buf) == w else 0.0
+            sums[w] = self.sums[w] - evicted + price
+
+        count, mean, m2, up_count, ret = self.count, self.mean, self.m2, self.up_count, None
+        if self.last_committed is not None:
+            ret = price / self.last_committed - 1.0
+            count += 1
+            delta = ret - mean
+            mean += delta / count
+            m2 += delta * (ret - mean)
+            if len(self.ups) == self.ups.maxlen:
+                up_count -= self.ups[0]
+            up_count += ret > 0
+
+        run_max = max(self.run_max, price)
+        mdd = min(self.mdd, price / run_max - 1.0)
+        return _Step(sums, count, mean, m2, up_count, run_max, mdd, ret)
+
+    def _commit(self, price: float) -> None:
+        step = self._step(price)
+        for buf in self.buffers.values():
+            buf.append(price)
+        if step.ret is not None:
+            self.ups.append(step.ret > 0)
+        self.sums = step.sums
+        self.count, self.mean, self.m2, self.up_count = step.count, step.mean, step.m2, step.up_count
+        self.run_max, self.mdd = step.run_max, step.mdd
+        self.last_committed = price
+
+    # 새 봉 반영: 같은 날짜면 미확정 봉만 교체, 더 뒤 날짜면 이전 봉을 확정하고 새 봉을 미확정으로
+    def push(self, date, price: float) -> None:
+        date = pd.Timestamp(date)
+        with self.state_lock:
+            if date < self.pending_date:
+                return
+            if date > self.pending_date:
+                self._commit(self.pending)
+                self.pending_date = date
+            self.pending = float(price)
+
+    # 현재 지표 값 (indicators.compute와 같은 정의)
+    def values(self) -> dict:
+        with self.state_lock:
+            return self._values()
+
+    def _values(self) -> dict:
+        step = self._step(self.pending)
+        ma = {}
+        for w, buf in self.buffers.items():
+            n = min(len(buf) + 1, w)
+            ma[w] = step.sums[w] / w if n == w else float("nan")
+        n_ups = min(len(self.ups) + (step.ret is not None), self.ups.maxlen)
+        return {
+            "date": self.pending_date,
+            "close": self.pending,
+            "prev_close": self.last_committed,
+            "ma": ma,
+            "drawdown": (self.pending / step.run_max - 1.0) * 100,
+            "mdd": step.mdd * 100,
+            "period_return": (self.pending / self.first - 1.0) * 100,
+            "vol_annual": math.sqrt(step.m2 / (step.count - 1)) * math.sqrt(TRADING_DAYS) * 100 if step.count > 1 else float("nan"),
+            "up_prob": step.up_count / n_ups * 100 if n_ups else float("nan"),
+        }
+
+    # 장중 가격 기록 (폴링 시각 → 가격)
+    def tick_series(self) -> pd.Series:
+        with self.state_lock:
+            ticks = list(self.ticks)
+        return pd.Series(dict(ticks), name="Close", dtype=np.float64)
+
+    # POLL_INTERVAL이 지났으면 미확정 봉 날짜부터 새 봉을 받아 반영. 다른 세션이 폴링 중이면 기다리지 않는다
+    def refresh(self, stock_code: str) -> bool:
+        if time.time() - self.last_poll < POLL_INTERVAL or not self.poll_lock.acquire(blocking=False):
+            return False
+        try:
+            if time.time() - self.last_poll < POLL_INTERVAL:
+                return False
+            import FinanceDataReader as fdr
+
+            start = self.pending_date.strftime("%Y%m%d")
+            with perf.span("live.poll", code=stock_code) as info:
+                bars = upstream.call("fdr", ("live", stock_code, start), fdr.DataReader, stock_code, start)
+                info["rows"] = len(bars)
+            for date, price in bars["Close"].dropna().items():
+                self.push(date, price)
+            with self.state_lock:
+                self.ticks.append((datetime.datetime.now(KST).replace(tzinfo=None), self.pending))
+            self.last_poll = time.time()
+            return True
+        finally:
+            self.poll_lock.release()
+
+
+_lock = threading.Lock()
+_trackers: dict[tuple, LiveIndicators] = {}
+
+
+# key=(종목코드, 시작일, 종료일) 트래커 (처음 한 번만 전체 종가로 초기화)
+def get_tracker(key: tuple, close: pd.Series) -> LiveIndicators:
+    with _lock:
+        tracker = _trackers.get(key)
+    if tracker is not None:
+        perf.count("live.tracker.hit")
+        return tracker
+
+    perf.count("live.tracker.miss")
+    with perf.span("live.init", bars=len(close)):
+        tracker = LiveIndicators(close)
+    with _lock:
+        tracker = _trackers.setdefault(key, tracker)
+        while len(_trackers) > MAX_TRACKERS:
+            _trackers.pop(next(iter(_trackers)))
+        return tracker
@@ -0,0 +1,179 @@
+# Google News RSS 조회 (세션 재사용 + 검색어별 TTL 캐시 + 조건부 GET + 백그라운드 갱신)
+# - 파싱된 기사 목록을 검색어별로 보관하므로 기사 개수 변경은 캐시를 잘라 쓰기만 한다
+# - 만료된 검색어는 기존 결과를 바로 돌려주고 ETag/Last-Modified로 백그라운드에서 재검증
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+
+from stockflow import perf
+from stockflow import upstream
+
+RSS_URL = "https://news.google.com/rss/search"
+NEWS_TTL = 5 * 60
+# 최근 이 시간 안에 조회된 검색어만 백그라운드 갱신 대상 (그보다 오래 안 쓰인 검색어는 캐시에서 제거)
+HOT_WINDOW = 30 * 60
+REFRESH_INTERVAL = 60
+REQUEST_TIMEOUT = (3, 10)
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_session.headers.update({"User-Agent": "StockFlow/1.0"})
+
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="news-fetch")
+_lock = threading.Lock()
+_refresher_started = False
+
+
+@dataclass
+class _CacheEntry:
+    entries: list[dict] = field(default_factory=list)
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+    last_access: float = 0.0
+    inflight: Future | None = None
+
+
+_cache: dict[str, _CacheEntry] = {}
+
+
+def _params(query: str) -> dict:
+    return {"q": query, "hl": "ko", "gl": "KR", "ceid": "KR:ko"}
+
+
+def _parse(text: str) -> list[dict]:
+    feed = feedparser.parse(text)
+    return [
+        {
+            "title": item.get("title", ""),
+            "link": item.get("link", ""),
+            "published": item.get("published", ""),
+        }
+        for item in feed.entries
+    ]
+
+
+# 조건부 GET으로 피드를 받아 캐시 갱신 (304면 기존 기사 목록 유지)
+def _revalidate(query: str) -> _CacheEntry:
+    with _lock:
+        entry = _cache.setdefault(query, _CacheEntry())
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+    with perf.span("news.rss", query=query) as info:
+        r = upstream.call(
+            "news", (query, tuple(sorted(headers.items()))),
+            _session.get, RSS_URL, params=_params(query), headers=headers, timeout=REQUEST_TIMEOUT,
+        )
+        info["status"] = r.status_code
+    if r.status_code == 304:
+        perf.count("news.not_modified")
+        with _lock:
+            entry.fetched_at = time.time()
+        return entry
+
+    r.raise_for_status()
+    with perf.span("news.parse", query=query, bytes=len(r.text)):
+        entries = _parse(r.text)
+    with _lock:
+        entry.entries = entries
+        entry.etag = r.headers.get("ETag")
+        entry.last_modified = r.headers.get("Last-Modified")
+        entry.fetched_at = time.time()
+    return entry
+
+
+# accessed_at을 주면 같은 잠금 안에서 조회 시각도 기록 (_evict_cold가 방금 만든 항목을 지우지 않도록)
+def _schedule(query: str, accessed_at: float | None = None) -> Future:
+    with _lock:
+        entry = _cache.setdefault(query, _CacheEntry())
+        if accessed_at is not None:
+            entry.last_access = accessed_at
+        if entry.inflight is None or entry.inflight.done():
+            entry.inflight = _pool.submit(_revalidate, query)
+        return entry.inflight
+
+
+# HOT_WINDOW 동안 조회되지 않은 검색어 제거 (받는 중인 검색어는 유지). _lock을 잡은 상태에서 호출
+def _evict_cold(now: float) -> None:
+    cold = [
+        q for q, e in _cache.items()
+        if now - e.last_access >= HOT_WINDOW and (e.inflight is None or e.inflight.done())
+    ]
+    for query in cold:
+        del _cache[query]
+    if cold:
+        perf.count("news.evict", len(cold))
+
+
+def _refresh_loop() -> None:
+    while True:
+        time.sleep(REFRESH_INTERVAL)
+        now = time.time()
+        with _lock:
+            _evict_cold(now)
+            hot = [
+                q for q, e in _cache.items()
+                if now - e.last_access < HOT_WINDOW and now - e.fetched_at > NEWS_TTL
+            ]
+        for query in hot:
+            _schedule(query)
+
+
+def _ensure_refresher() -> None:
+    global _refresher_started
+    with _lock:
+        if _refresher_started:
+            return
+        _refresher_started = True
+    threading.Thread(target=_refresh_loop, name="news-refresh", daemon=True).start()
+
+
+# 화면에 보이기 전에 미리 받아 두기 (이미 신선한 캐시가 있으면 아무것도 하지 않음)
+def prefetch(query: str) -> Future | None:
+    _ensure_refresher()
+    now = time.time()
+    with _lock:
+        entry = _cache.get(query)
+        if entry is not None and now - entry.fetched_at <= NEWS_TTL:
+            return None
+    return _schedule(query, now)
+
+
+# 검색어의 기사 목록 반환
+# - 캐시가 있으면 (만료됐어도) 즉시 반환하고 필요 시 백그라운드 재검증
+# - 캐시가 없으면 최대 wait초만 기다리고, 그 안에 못 받으면 None (다음 rerun 때 표시)
+def get_news(query: str, wait: float = 3.0) -> list[dict] | None:
+    _ensure_refresher()
+    now = time.time()
+    with _lock:
+        entry = _cache.get(query)
+        if entry is not None:
+            entry.last_access = now
+        has_data = entry is not None and entry.fetched_at > 0
+        entries, fetched_at = (entry.entries, entry.fetched_at) if has_data else (None, 0.0)
+
+    if has_data:
+        if now - fetched_at > NEWS_TTL:
+            perf.count("news.stale")
+            _schedule(query, now)
+        else:
+            perf.count("news.hit")
+        return entries
+
+    perf.count("news.miss")
+    future = _schedule(query, now)
+    try:
+        with perf.span("news.wait", query=query):
+            return future.result(timeout=wait).entries
+    except FutureTimeout:
+        return None
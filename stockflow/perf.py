@@ -0,0 +1,161 @@
+# 성능 계측 (rerun 단위 구간 타이머 + 캐시 적중/미스 카운터 + 페이로드 크기)
+# - 스크립트 시작에 begin_run(), 끝에 end_run() → data/perf.jsonl에 한 줄씩 기록
+# - 백그라운드 스레드(프리페치 등)의 구간은 프로세스 전체 누적 통계에만 반영
+# - 프래그먼트만 다시 실행될 때는 fragment()로 감싸 별도 기록
+# - 사이드바 디버그 패널: STOCKFLOW_DEBUG=1 또는 URL에 ?debug=1
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import streamlit as st
+
+from stockflow.config import DATA_DIR
+
+PERF_LOG_PATH = DATA_DIR / "perf.jsonl"
+# STOCKFLOW_PERF_LOG=off 이면 JSONL 기록 안 함
+PERF_LOG_ENABLED = os.getenv("STOCKFLOW_PERF_LOG", "on").lower() not in ("off", "0", "false")
+
+_local = threading.local()
+_lock = threading.Lock()
+_counters: Counter = Counter()
+_span_stats: dict[str, list[float]] = {}  # 이름 → [횟수, 누적 ms, 최대 ms]
+
+
+@dataclass
+class RunRecord:
+    page: str
+    ts: float = field(default_factory=time.time)
+    started: float = field(default_factory=time.perf_counter)
+    spans: list[dict] = field(default_factory=list)
+    counters: Counter = field(default_factory=Counter)
+    payloads: dict[str, int] = field(default_factory=dict)
+
+
+def _current_run() -> RunRecord | None:
+    return getattr(_local, "run", None)
+
+
+def _write(record: dict) -> None:
+    if not PERF_LOG_ENABLED:
+        return
+    line = json.dumps(record, ensure_ascii=False)
+    with _lock:
+        PERF_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(PERF_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def _finish(run: RunRecord, completed: bool) -> None:
+    _write({
+        "ts": run.ts,
+        "page": run.page,
+        "completed": completed,
+        "total_ms": round((time.perf_counter() - run.started) * 1000, 3),
+        "spans": run.spans,
+        "counters": dict(run.counters),
+        "payloads": run.payloads,
+    })
+
+
+# 스크립트 시작 시 호출. st.stop() 등으로 끝나지 못한 이전 rerun은 completed=false로 기록
+def begin_run(page: str) -> None:
+    prev = st.session_state.get("_perf_run")
+    if prev is not None:
+        _finish(prev, completed=False)
+    run = RunRecord(page)
+    st.session_state["_perf_run"] = run
+    _local.run = run
+
+
+def end_run() -> None:
+    run = st.session_state.pop("_perf_run", None)
+    _local.run = None
+    if run is not None:
+        _finish(run, completed=True)
+
+
+# 프래그먼트 단독 rerun(위젯 변경으로 해당 프래그먼트만 다시 실행)도 한 건의 실행으로 기록
+@contextmanager
+def fragment(name: str):
+    if _current_run() is not None:
+        yield
+        return
+    run = RunRecord(name)
+    _local.run = run
+    try:
+        yield
+    finally:
+        _local.run = None
+        _finish(run, completed=True)
+
+
+@contextmanager
+def span(name: str, **fields):
+    # with perf.span("fdr.DataReader", code=...) as info: info["rows"] = len(df) 처럼 필드 추가 가능
+    info = dict(fields)
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        with _lock:
+            stats = _span_stats.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += ms
+            stats[2] = max(stats[2], ms)
+        run = _current_run()
+        if run is not None:
+            run.spans.append({"name": name, "ms": round(ms, 3), **info})
+
+
+def count(name: str, n: int = 1) -> None:
+    with _lock:
+        _counters[name] += n
+    run = _current_run()
+    if run is not None:
+        run.counters[name] += n
+
+
+def payload(name: str, nbytes: int) -> None:
+    run = _current_run()
+    if run is not None:
+        run.payloads[name] = run.payloads.get(name, 0) + int(nbytes)
+
+
+def counters() -> dict[str, int]:
+    with _lock:
+        return dict(_counters)
+
+
+def span_stats() -> dict[str, dict]:
+    with _lock:
+        return {
+            name: {"count": int(c), "avg_ms": round(total / c, 3) if c else 0.0, "max_ms": round(mx, 3)}
+            for name, (c, total, mx) in _span_stats.items()
+        }
+
+
+def debug_enabled() -> bool:
+    return os.getenv("STOCKFLOW_DEBUG") == "1" or st.query_params.get("debug") == "1"
+
+
+# 사이드바 디버그 패널: 이번 rerun의 구간/카운터/페이로드 + 프로세스 누적 통계
+def render_debug_panel() -> None:
+    if not debug_enabled():
+        return
+    run = _current_run()
+    with st.sidebar.expander("⏱️ 성능 디버그", expanded=False):
+        if run is not None:
+            st.caption(f"이번 실행: {(time.perf_counter() - run.started) * 1000:,.1f} ms")
+            if run.spans:
+                st.dataframe(run.spans, use_container_width=True)
+            if run.payloads:
+                st.json(run.payloads)
+        st.caption("캐시 적중/미스 (프로세스 누적)")
+        st.json(counters())
+        st.caption("구간별 누적 통계")
+        st.dataframe([{"name": name, **stats} for name, stats in span_stats().items()], use_container_width=True)
@@ -0,0 +1,63 @@
+# '조회하기' 시점에 다른 페이지가 쓸 데이터를 백그라운드에서 동시에 받아 두기
+# - DART: corp_code 조회 → 최근 연도 재무제표 프리페치 (기본 화면의 보고서가 준비될 때까지)
+# - 뉴스: 회사명 검색 결과
+# - 주가는 메인 페이지가 바로 그려야 하므로 호출한 스레드에서 받고, 나머지는 그동안 풀에서 진행
+# 결과는 각 모듈의 공유 캐시(dart/news)에 들어가므로 여기서는 진행 중인 작업(Future)만 보관
+# (DART는 종목코드, 뉴스는 검색어 기준. 끝난 작업은 바로 지운다)
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from stockflow import dart
+from stockflow import news
+from stockflow import perf
+
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="prefetch")
+_lock = threading.Lock()
+_jobs: dict[tuple[str, str], Future] = {}
+
+
+def _prefetch_dart(api_key: str, stock_code: str, company_name: str) -> str | None:
+    with perf.span("prefetch.dart", code=stock_code):
+        corp_code = dart.resolve_corp_code(api_key, stock_code=stock_code, corp_name=company_name)
+        if corp_code is None:
+            return None
+        years = dart.recent_years()
+        dart.prefetch_finstates(api_key, corp_code, years)
+        dart.get_finstate(api_key, corp_code, years[1], dart.DEFAULT_REPORT)
+    return corp_code
+
+
+def _prefetch_news(query: str) -> None:
+    with perf.span("prefetch.news", query=query):
+        future = news.prefetch(query)
+        if future is not None:
+            future.result()
+
+
+# 같은 작업이 진행 중이면 다시 시작하지 않음
+def start(stock_code: str, company_name: str, api_key: str | None) -> None:
+    if api_key:
+        _submit(("dart", stock_code), _prefetch_dart, api_key, stock_code, company_name)
+    _submit(("news", company_name), _prefetch_news, company_name)
+    perf.count("prefetch.start")
+
+
+def _submit(key: tuple[str, str], fn, *args) -> None:
+    with _lock:
+        if key in _jobs:
+            return
+        future = _jobs[key] = _pool.submit(fn, *args)
+    # 이미 끝났으면 add_done_callback이 바로 호출하므로 _lock 밖에서 등록
+    future.add_done_callback(lambda f: _finish(key, f))
+
+
+def _finish(key: tuple[str, str], future: Future) -> None:
+    with _lock:
+        if _jobs.get(key) is future:
+            del _jobs[key]
+
+
+# 아직 끝나지 않은 항목 이름 ("dart", "news"). news_query는 뉴스 탭이 검색할 검색어
+def pending(stock_code: str | None, news_query: str | None) -> list[str]:
+    with _lock:
+        return [name for name, key in (("dart", stock_code), ("news", news_query)) if (name, key) in _jobs]
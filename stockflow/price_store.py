@@ -0,0 +1,111 @@
+# 종목별 주가(OHLCV) 로컬 저장소
+# - 종목코드별 Parquet 파일(data/prices/<종목코드>.parquet)에 일봉을 보관
+# - 보관 중인 날짜 구간을 <종목코드>.json에 기록하고, 요청 구간 중 빠진 앞/뒤 구간만 fdr로 받아온다
+import datetime
+import json
+import threading
+
+import pandas as pd
+
+from stockflow import perf
+from stockflow import upstream
+from stockflow.config import DATA_DIR
+from stockflow.storage import write_atomic
+
+PRICE_DIR = DATA_DIR / "prices"
+
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(stock_code: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(stock_code, threading.Lock())
+
+
+def _to_date(value) -> datetime.date:
+    return pd.Timestamp(value).date()
+
+
+def _read_coverage(stock_code: str) -> tuple[datetime.date, datetime.date] | None:
+    meta_path = PRICE_DIR / f"{stock_code}.json"
+    if not meta_path.exists():
+        return None
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    return _to_date(meta["start"]), _to_date(meta["end"])
+
+
+def _save(stock_code: str, df: pd.DataFrame, start: datetime.date, end: datetime.date) -> None:
+    write_atomic(PRICE_DIR / f"{stock_code}.parquet", df.to_parquet)
+    meta = json.dumps({"start": start.isoformat(), "end": end.isoformat()})
+    write_atomic(PRICE_DIR / f"{stock_code}.json", lambda p: p.write_text(meta, encoding="utf-8"))
+
+
+def read_stored(stock_code: str) -> pd.DataFrame:
+    path = PRICE_DIR / f"{stock_code}.parquet"
+    if not path.exists():
+        return pd.DataFrame()
+    return pd.read_parquet(path)
+
+
+def _fetch(stock_code: str, start: datetime.date, end: datetime.date) -> pd.DataFrame:
+    # import에 1초 가까이 걸리므로 실제로 수집할 때 불러온다 (로컬 저장소만 읽는 요청은 비용 없음)
+    import FinanceDataReader as fdr
+
+    with perf.span("fdr.DataReader", code=stock_code, start=start.isoformat(), end=end.isoformat()) as info:
+        s, e = start.strftime("%Y%m%d"), end.strftime("%Y%m%d")
+        df = upstream.call("fdr", (stock_code, s, e), fdr.DataReader, stock_code, s, e)
+        info["rows"] = len(df)
+    return df
+
+
+# 로컬 저장소가 요청 구간을 모두 덮을 때만 그 구간을 반환 (네트워크 수집 없음, 아니면 None)
+def load_stored(stock_code: str, start, end) -> pd.DataFrame | None:
+    start, end = _to_date(start), _to_date(end)
+    with _lock_for(stock_code):
+        coverage = _read_coverage(stock_code)
+        if coverage is None or start < coverage[0] or end > coverage[1]:
+            return None
+        stored = read_stored(stock_code)
+    mask = (stored.index >= pd.Timestamp(start)) & (stored.index <= pd.Timestamp(end))
+    return stored.loc[mask].copy()
+
+
+# 요청 구간의 주가를 반환 (로컬에 없는 앞/뒤 구간만 네트워크로 수집)
+def load_prices(stock_code: str, start, end) -> pd.DataFrame:
+    start, end = _to_date(start), _to_date(end)
+    today = datetime.date.today()
+
+    with _lock_for(stock_code):
+        coverage = _read_coverage(stock_code)
+        stored = read_stored(stock_code) if coverage else pd.DataFrame()
+
+        missing = []
+        if coverage is None:
+            missing.append((start, end))
+        else:
+            held_start, held_end = coverage
+            if start < held_start:
+                missing.append((start, held_start - datetime.timedelta(days=1)))
+            if end > held_end:
+                missing.append((held_end + datetime.timedelta(days=1), end))
+
+        perf.count("price_store.miss" if missing else "price_store.hit")
+        if missing:
+            fetched = [_fetch(stock_code, s, e) for s, e in missing]
+            frames = [f for f in [stored, *fetched] if not f.empty]
+            if frames:
+                merged = pd.concat(frames)
+                stored = merged[~merged.index.duplicated(keep="last")].sort_index()
+
+            new_start = min(start, coverage[0]) if coverage else start
+            new_end = max(end, coverage[1]) if coverage else end
+            # 오늘 봉은 장중에 계속 바뀌므로 완료된 구간으로 기록하지 않는다 (다음 조회 때 다시 수집)
+            new_end = min(new_end, today - datetime.timedelta(days=1))
+            if new_end >= new_start:
+                _save(stock_code, stored, new_start, new_end)
+
+    if stored.empty:
+        return stored
+    mask = (stored.index >= pd.Timestamp(start)) & (stored.index <= pd.Timestamp(end))
+    return stored.loc[mask].copy()
@@ -0,0 +1,98 @@
+# 몬테카를로 가격 범위 전망 (조회 기간의 일간 로그수익률로 향후 N거래일 경로를 시뮬레이션)
+# - bootstrap: 과거 일간 수익률을 복원 추출, gbm: 과거 평균/표준편차로 맞춘 기하 브라운 운동
+# - 경로는 묶음(chunk) 단위로 만들어 버리고, 필요한 값(종가 상승 여부, 경로별 최대낙폭, 일부 날짜의 가격)만 모은다
+#   → 메모리는 chunk × 기간 + 경로 수 × 밴드 날짜 수로 제한
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from stockflow import perf
+from stockflow.indicators import data_fingerprint
+
+METHODS = {"bootstrap": "과거 수익률 재표본", "gbm": "GBM(정규분포)"}
+PERCENTILES = (5, 25, 50, 75, 95)
+N_PATHS = 20_000
+CHUNK_PATHS = 4_000
+# 팬 차트에 쓰는 날짜 수 (기간이 더 길면 균등 간격으로 골라 저장)
+MAX_BAND_POINTS = 60
+MIN_RETURNS = 20
+
+
+@dataclass(frozen=True)
+class Projection:
+    method: str
+    horizon: int
+    n_paths: int
+    last_close: float
+    p_up: float               # 기간 끝 종가가 현재가보다 높을 확률 (%)
+    bands: pd.DataFrame       # index=경과 거래일, columns=백분위 → 가격
+    drawdowns: np.ndarray     # 경로별 최대낙폭 (%)
+
+    def final_percentile(self, q: int) -> float:
+        return float(self.bands[q].iloc[-1])
+
+
+def _log_returns(close: pd.Series) -> np.ndarray:
+    values = close.dropna().to_numpy(dtype=np.float64)
+    rets = np.diff(np.log(values[values > 0]))
+    return rets[np.isfinite(rets)]
+
+
+def _chunk_paths(rng: np.random.Generator, rets: np.ndarray, method: str, size: int, horizon: int) -> np.ndarray:
+    if method == "bootstrap":
+        steps = rets[rng.integers(0, len(rets), size=(size, horizon))]
+    else:
+        mu, sigma = rets.mean(), rets.std(ddof=1)
+        steps = rng.normal(mu, sigma, size=(size, horizon))
+    return np.cumsum(steps, axis=1)
+
+
+def simulate(close: pd.Series, horizon: int, method: str = "bootstrap",
+             n_paths: int = N_PATHS, chunk: int = CHUNK_PATHS, seed: int | None = 0) -> Projection:
+    if method not in METHODS:
+        raise ValueError(f"알 수 없는 시뮬레이션 방식: {method}")
+    rets = _log_returns(close)
+    if len(rets) < MIN_RETURNS:
+        raise ValueError(f"시뮬레이션에는 최소 {MIN_RETURNS + 1}거래일의 주가가 필요합니다.")
+
+    last_close = float(close.dropna().iloc[-1])
+    band_days = np.unique(np.linspace(1, horizon, min(horizon, MAX_BAND_POINTS)).round().astype(int))
+    rng = np.random.default_rng(seed)
+
+    band_logs = np.empty((n_paths, len(band_days)), dtype=np.float32)
+    drawdowns = np.empty(n_paths, dtype=np.float32)
+    ups = 0
+    for lo in range(0, n_paths, chunk):
+        size = min(chunk, n_paths - lo)
+        log_path = _chunk_paths(rng, rets, method, size, horizon)  # 현재가 대비 누적 로그수익률
+        ups += int((log_path[:, -1] > 0).sum())
+        # 시작점(0) 포함 누적 고점 대비 낙폭
+        peak = np.maximum.accumulate(np.maximum(log_path, 0.0), axis=1)
+        drawdowns[lo:lo + size] = np.expm1((log_path - peak).min(axis=1)) * 100
+        band_logs[lo:lo + size] = log_path[:, band_days - 1]
+
+    bands = last_close * np.exp(np.percentile(band_logs, PERCENTILES, axis=0).T)
+    return Projection(
+        method=method,
+        horizon=horizon,
+        n_paths=n_paths,
+        last_close=last_close,
+        p_up=ups / n_paths * 100,
+        bands=pd.DataFrame(bands, index=pd.Index(band_days, name="거래일"), columns=list(PERCENTILES)),
+        drawdowns=drawdowns,
+    )
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached(key, fingerprint, horizon, method, n_paths, _close: pd.Series) -> Projection:
+    perf.count("projection.miss")
+    with perf.span("projection.simulate", horizon=horizon, method=method, paths=n_paths):
+        return simulate(_close, horizon, method, n_paths)
+
+
+# key=(종목코드, 시작일, 종료일). (종목, 기간, 전망 기간, 방식)별로 한 번만 시뮬레이션
+def get_projection(key, close: pd.Series, horizon: int, method: str = "bootstrap", n_paths: int = N_PATHS) -> Projection:
+    perf.count("projection.call")
+    return _cached(key, data_fingerprint(close), horizon, method, n_paths, close)
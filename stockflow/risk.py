@@ -0,0 +1,125 @@
+# 롤링 위험 지표 (기간별 곡선: 최대낙폭, 연환산 변동성, 시장 지수 대비 베타/상관계수)
+# - 변동성/베타/상관은 수익률 x, y, x², y², xy의 누적합 차이로 창(window)마다 O(1)에 계산
+# - 롤링 최대낙폭은 sliding_window_view로 (창 개수 × 창 길이) 뷰를 만들어 누적 최대를 한 번에 계산
+#   → 복사본은 행 묶음(chunk) 단위로만 생기므로 메모리는 CHUNK_ELEMENTS로 제한
+# - 결과는 (종목, 기간, 지수, 창 길이)별로 메모이즈
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from numpy.lib.stride_tricks import sliding_window_view
+
+from stockflow import perf
+from stockflow.indicators import TRADING_DAYS, data_fingerprint
+
+# 화면 이름 → FinanceDataReader 지수 코드
+BENCHMARKS = {"KOSPI": "KS11", "KOSDAQ": "KQ11"}
+WINDOWS = (20, 60, 120, 252)
+CHUNK_ELEMENTS = 4_000_000
+
+
+@dataclass(frozen=True)
+class RollingRisk:
+    index: pd.DatetimeIndex
+    mdd: dict[int, np.ndarray]     # 창 안의 최대낙폭 (%), 앞쪽 w-1개는 NaN
+    vol: dict[int, np.ndarray]     # 연환산 변동성 (%)
+    beta: dict[int, np.ndarray]    # 지수 대비 베타 (지수 데이터가 없으면 빈 dict)
+    corr: dict[int, np.ndarray]    # 지수와의 상관계수
+
+    def series(self, name: str, window: int) -> pd.Series:
+        return pd.Series(getattr(self, name)[window], index=self.index, name=f"{name}{window}")
+
+
+def _window_sums(values: np.ndarray, w: int) -> np.ndarray:
+    csum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    return csum[w:] - csum[:-w]
+
+
+# 창 길이 w의 최대낙폭 (창 끝 날짜 기준). close 길이와 같고 앞쪽 w-1개는 NaN
+def rolling_mdd(close: np.ndarray, w: int) -> np.ndarray:
+    n = len(close)
+    out = np.full(n, np.nan)
+    if w < 2 or n < w:
+        return out
+    windows = sliding_window_view(close, w)
+    chunk = max(1, CHUNK_ELEMENTS // w)
+    for lo in range(0, len(windows), chunk):
+        block = windows[lo:lo + chunk]
+        drawdown = block / np.maximum.accumulate(block, axis=1) - 1.0
+        out[w - 1 + lo:w - 1 + lo + len(block)] = drawdown.min(axis=1) * 100
+    return out
+
+
+# 창 길이 w의 표본 분산 (ddof=1). 누적합 상쇄 오차를 줄이려고 전체 평균을 먼저 뺀다
+def _rolling_cov(x: np.ndarray, y: np.ndarray, w: int) -> np.ndarray:
+    x = x - x.mean()
+    y = y - y.mean()
+    sx, sy, sxy = _window_sums(x, w), _window_sums(y, w), _window_sums(x * y, w)
+    return (sxy - sx * sy / w) / (w - 1)
+
+
+def _pad(values: np.ndarray, n: int) -> np.ndarray:
+    return np.concatenate((np.full(n - len(values), np.nan), values))
+
+
+# 일간 수익률 창 w의 연환산 변동성 (%). 수익률은 둘째 날부터 있으므로 앞쪽 w개가 NaN
+def rolling_vol(ret: np.ndarray, w: int) -> np.ndarray:
+    n = len(ret) + 1
+    if w < 2 or len(ret) < w:
+        return np.full(n, np.nan)
+    var = np.maximum(_rolling_cov(ret, ret, w), 0.0)
+    return _pad(np.sqrt(var * TRADING_DAYS) * 100, n)
+
+
+# 지수 수익률 대비 (베타, 상관계수). 분산이 0인 창은 NaN
+def rolling_beta_corr(ret: np.ndarray, bench_ret: np.ndarray, w: int) -> tuple[np.ndarray, np.ndarray]:
+    n = len(ret) + 1
+    if w < 2 or len(ret) < w:
+        return np.full(n, np.nan), np.full(n, np.nan)
+    cov = _rolling_cov(ret, bench_ret, w)
+    var_stock = _rolling_cov(ret, ret, w)
+    var_bench = _rolling_cov(bench_ret, bench_ret, w)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = np.where(var_bench > 0, cov / var_bench, np.nan)
+        corr = np.where((var_bench > 0) & (var_stock > 0), cov / np.sqrt(var_stock * var_bench), np.nan)
+    return _pad(beta, n), _pad(np.clip(corr, -1.0, 1.0), n)
+
+
+# 종가와 지수 종가를 같은 거래일로 맞춰 모든 창 길이의 롤링 지표 계산 (지수가 없으면 베타/상관 생략)
+def compute(close: pd.Series, bench_close: pd.Series | None = None, windows=WINDOWS) -> RollingRisk:
+    close = close.dropna()
+    if bench_close is not None and not bench_close.dropna().empty:
+        bench_close = bench_close.dropna().reindex(close.index).ffill()
+        keep = bench_close.notna().to_numpy()
+        close, bench_close = close[keep], bench_close[keep]
+    else:
+        bench_close = None
+
+    values = close.to_numpy(dtype=np.float64)
+    ret = values[1:] / values[:-1] - 1.0 if len(values) >= 2 else np.empty(0)
+    mdd, vol, beta, corr = {}, {}, {}, {}
+    for w in windows:
+        mdd[w] = rolling_mdd(values, w)
+        vol[w] = rolling_vol(ret, w) if len(values) else np.empty(0)
+    if bench_close is not None and len(values) >= 2:
+        bench = bench_close.to_numpy(dtype=np.float64)
+        bench_ret = bench[1:] / bench[:-1] - 1.0
+        for w in windows:
+            beta[w], corr[w] = rolling_beta_corr(ret, bench_ret, w)
+
+    return RollingRisk(index=close.index, mdd=mdd, vol=vol, beta=beta, corr=corr)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached(key, bench_key, fingerprint, windows, _close: pd.Series, _bench_close: pd.Series | None) -> RollingRisk:
+    perf.count("risk.miss")
+    with perf.span("risk.compute", bars=len(_close), windows=len(windows)):
+        return compute(_close, _bench_close, windows)
+
+
+# key=(종목코드, 시작일, 종료일), bench_key=지수 데이터셋 키. 데이터가 갱신됐으면(길이/마지막 봉) 다시 계산
+def get_risk(key, close: pd.Series, bench_key=None, bench_close: pd.Series | None = None, windows=WINDOWS) -> RollingRisk:
+    perf.count("risk.call")
+    fingerprint = (data_fingerprint(close), data_fingerprint(bench_close))
+    return _cached(key, bench_key, fingerprint, tuple(sorted(windows)), close, bench_close)
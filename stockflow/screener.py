@@ -0,0 +1,170 @@
+# 전 종목 스크리너 (상장사 전체의 기간 수익률 / MDD / 변동성 / 상승일 비율)
+# - 상장사 전체를 프로세스 풀로 나눠 로컬 저장소(price_store)에 수집
+# - 종가를 (날짜 × 종목) 행렬로 모아 지표를 한 번의 행렬 연산으로 계산
+# - 종가 행렬(data/screener_closes.parquet)과 지표 스냅샷(data/screener.parquet)을 보관하고,
+#   갱신 때는 행렬의 마지막 날짜 이후 구간만 수집해 덧붙인다
+#
+# 야간 갱신: python -m stockflow.screener --refresh
+import argparse
+import datetime
+import time
+
+import numpy as np
+import pandas as pd
+
+from stockflow import company
+from stockflow import perf
+from stockflow import workers
+from stockflow.config import DATA_DIR
+from stockflow.indicators import UP_LOOKBACK, matrix_metrics
+from stockflow.price_store import load_prices
+from stockflow.storage import write_atomic
+
+SNAPSHOT_PATH = DATA_DIR / "screener.parquet"
+CLOSES_PATH = DATA_DIR / "screener_closes.parquet"
+# 지표 계산 구간 (최근 1년, 달력일 기준)
+PERIOD_DAYS = 365
+MAX_WORKERS = workers.MAX_PROCESSES
+
+
+# 프로세스 풀 작업 단위: 한 종목을 로컬 저장소에 수집하고 종가만 돌려준다 (예외는 문자열로 반환)
+def _fetch_close(task: tuple[str, str, str]) -> tuple[str, pd.Series | None, str | None]:
+    code, start, end = task
+    try:
+        df = load_prices(code, start, end)
+    except Exception as e:
+        return code, None, str(e)
+    if df.empty:
+        return code, None, None
+    return code, df["Close"].astype(np.float32), None
+
+
+def _fetch_all(tasks: list[tuple[str, str, str]], max_workers: int, progress=None):
+    closes: dict[str, pd.Series] = {}
+    errors: dict[str, str] = {}
+    if max_workers <= 1:
+        results = map(_fetch_close, tasks)
+        pool = None
+    else:
+        pool = workers.process_pool(max_workers)
+        results = pool.map(_fetch_close, tasks, chunksize=16)
+    try:
+        for done, (code, close, error) in enumerate(results, start=1):
+            if error is not None:
+                errors[code] = error
+            elif close is not None:
+                closes[code] = close
+            if progress is not None:
+                progress(done, len(tasks))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return closes, errors
+
+
+# (날짜 × 종목) 종가 행렬 → 종목별 지표. 상장 전/거래 정지 구간은 NaN
+def screen_metrics(closes: pd.DataFrame, up_lookback: int = UP_LOOKBACK) -> pd.DataFrame:
+    m = matrix_metrics(closes.to_numpy(dtype=np.float64))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        recent = m.daily_ret[-up_lookback:]
+        up_ratio = (np.nan_to_num(recent) > 0).sum(axis=0) / (~np.isnan(recent)).sum(axis=0) * 100
+
+    result = pd.DataFrame(
+        {
+            "현재가": m.last,
+            "기간 수익률(%)": m.period_return,
+            "최대낙폭(%)": m.mdd,
+            "변동성(연환산, %)": m.vol_annual,
+            "상승일 비율(%)": up_ratio,
+            "거래일수": m.trading_days,
+        },
+        index=closes.columns,
+    )
+    result.index.name = "종목코드"
+    return result
+
+
+def load_closes() -> pd.DataFrame | None:
+    if not CLOSES_PATH.exists():
+        return None
+    return pd.read_parquet(CLOSES_PATH)
+
+
+def load_snapshot() -> pd.DataFrame | None:
+    if not SNAPSHOT_PATH.exists():
+        return None
+    return pd.read_parquet(SNAPSHOT_PATH)
+
+
+# 상장사 전체 갱신. 기존 종가 행렬이 있으면 마지막 날짜부터 오늘까지만 수집(full=True면 전체 구간)
+# 오늘 봉은 장중에 바뀌므로 마지막 날짜도 다시 받아 덮어쓴다
+def refresh(max_workers: int = MAX_WORKERS, full: bool = False, limit: int | None = None, progress=None):
+    today = datetime.date.today()
+    period_start = today - datetime.timedelta(days=PERIOD_DAYS)
+
+    listing = company.load_listing()
+    if limit is not None:
+        listing = listing.head(limit)
+    codes = listing["종목코드"].tolist()
+    names = dict(zip(listing["종목코드"], listing["회사명"]))
+
+    held = None if full else load_closes()
+    tail_start = held.index.max().date() if held is not None and len(held) else None
+
+    tasks = []
+    for code in codes:
+        start = tail_start if tail_start is not None and code in held.columns else period_start
+        tasks.append((code, start.isoformat(), today.isoformat()))
+
+    with perf.span("screener.fetch", tickers=len(tasks), workers=max_workers):
+        fetched, errors = _fetch_all(tasks, max_workers, progress)
+
+    with perf.span("screener.metrics", tickers=len(codes)):
+        new_rows = pd.concat(fetched, axis=1) if fetched else pd.DataFrame(index=pd.DatetimeIndex([]))
+        if held is not None:
+            closes = pd.concat([held, new_rows])
+            closes = closes[~closes.index.duplicated(keep="last")]
+        else:
+            closes = new_rows
+        # 상장폐지 등으로 명단에서 빠진 종목은 제외하고 계산 구간 밖의 날짜는 버린다
+        closes = closes.reindex(columns=[c for c in codes if c in closes.columns]).sort_index()
+        closes = closes.loc[closes.index >= pd.Timestamp(period_start)].astype(np.float32)
+        # 전부 실패했으면 (네트워크 장애 등) 빈 스냅샷으로 덮어쓰지 않고 기존 파일을 유지
+        if closes.empty:
+            first_error = next(iter(errors.values()), "수집된 종목 없음")
+            raise RuntimeError(f"종가를 하나도 수집하지 못해 스냅샷을 갱신하지 않았습니다: {first_error}")
+
+        snapshot = screen_metrics(closes)
+        snapshot.insert(0, "회사명", snapshot.index.map(names))
+        snapshot["기준일"] = closes.index.max()
+
+    write_atomic(CLOSES_PATH, closes.to_parquet)
+    write_atomic(SNAPSHOT_PATH, snapshot.to_parquet)
+    return snapshot, errors
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="전 종목 스크리너 스냅샷 갱신")
+    parser.add_argument("--refresh", action="store_true", help="상장사 전체 지표 갱신")
+    parser.add_argument("--full", action="store_true", help="기존 종가 행렬을 무시하고 전체 구간 다시 계산")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--limit", type=int, default=None, help="앞에서부터 N개 종목만 (테스트용)")
+    args = parser.parse_args(argv)
+
+    if not args.refresh:
+        snapshot = load_snapshot()
+        print("스냅샷 없음" if snapshot is None else f"{len(snapshot)}개 종목, 기준일 {snapshot['기준일'].max():%Y-%m-%d}")
+        return
+
+    started = time.perf_counter()
+    try:
+        snapshot, errors = refresh(max_workers=args.workers, full=args.full, limit=args.limit)
+    except RuntimeError as e:
+        raise SystemExit(str(e))
+    print(f"{len(snapshot)}개 종목 갱신 ({time.perf_counter() - started:.1f}s), 실패 {len(errors)}개 → {SNAPSHOT_PATH}")
+    for code, msg in list(errors.items())[:20]:
+        print(f"  {code}: {msg}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+# 로컬 저장소 파일 쓰기 공용 함수
+import os
+import tempfile
+from pathlib import Path
+
+
+# 같은 폴더의 고유한 임시 파일에 쓴 뒤 os.replace로 교체
+# → 읽는 쪽은 항상 완성된 파일만 보고, 여러 스레드/프로세스가 같은 파일을 써도 서로의 임시 파일을 건드리지 않는다
+# write는 임시 파일 경로(Path)를 받아 내용을 기록하는 함수
+def write_atomic(path: Path, write) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False) as f:
+        tmp_path = Path(f.name)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
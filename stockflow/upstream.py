@@ -0,0 +1,101 @@
+# 외부 소스 호출 공통 계층
+# - single-flight: 같은 (소스, 키) 요청이 동시에 들어오면 한 번만 호출하고 결과를 함께 사용
+# - 소스별 동시 호출 수 제한 (세마포어)
+# - 일시적 오류는 지수 백오프 + 지터로 재시도
+# 공유된 결과 객체는 여러 호출자가 같이 보므로 수정하지 말 것
+import random
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+from stockflow import perf
+
+
+@dataclass
+class Source:
+    name: str
+    max_concurrency: int
+    retries: int = 2
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    semaphore: threading.BoundedSemaphore = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.semaphore = threading.BoundedSemaphore(self.max_concurrency)
+
+
+SOURCES = {
+    "fdr": Source("fdr", max_concurrency=4, retries=3),
+    "kind": Source("kind", max_concurrency=1, retries=2),
+    "dart": Source("dart", max_concurrency=4, retries=3),
+    "news": Source("news", max_concurrency=4, retries=1),
+}
+
+_lock = threading.Lock()
+_inflight: dict[tuple, Future] = {}
+
+
+# 입력값 문제(잘못된 종목코드 등)나 4xx 응답은 재시도해도 결과가 같으므로 바로 실패
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, (ValueError, KeyError, TypeError)):
+        return False
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None and 400 <= status < 500 and status != 429:
+        return False
+    return True
+
+
+def _call_with_retry(source: Source, fn, args, kwargs):
+    attempt = 0
+    while True:
+        with source.semaphore:
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if attempt >= source.retries or not _is_retryable(e):
+                    perf.count(f"upstream.{source.name}.error")
+                    raise
+        # 세마포어를 놓은 상태에서 대기 (full jitter)
+        delay = min(source.backoff_max, source.backoff_base * 2 ** attempt)
+        time.sleep(random.uniform(0, delay))
+        attempt += 1
+        perf.count(f"upstream.{source.name}.retry")
+
+
+# 같은 키로 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 직접 호출 (동시 호출 제한/재시도 없음)
+# 로컬 파일 적재처럼 안쪽에서 다시 call()을 부르는 작업용
+def single_flight(key, fn, *args, **kwargs):
+    return _join_or_lead(key, lambda: fn(*args, **kwargs))
+
+
+# 외부 소스 호출: single-flight + 소스별 동시 호출 제한 + 재시도
+def call(source_name: str, key, fn, *args, **kwargs):
+    source = SOURCES[source_name]
+    return _join_or_lead((source_name, key), lambda: _call_with_retry(source, fn, args, kwargs))
+
+
+def _join_or_lead(flight_key, run):
+    with _lock:
+        future = _inflight.get(flight_key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _inflight[flight_key] = future
+
+    if not leader:
+        perf.count(f"upstream.{flight_key[0]}.coalesced")
+        return future.result()
+
+    try:
+        result = run()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _lock:
+            _inflight.pop(flight_key, None)
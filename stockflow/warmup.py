@@ -0,0 +1,135 @@
+# 서버 기동 직후 예열 (STOCKFLOW_WARMUP=1일 때 프로세스마다 한 번, 백그라운드 스레드)
+# - 지연 import한 무거운 모듈(FinanceDataReader, plotly.subplots)을 미리 불러 둔다
+# - KIND 상장사 명단 + 검색 인덱스, DART corp_codes 인덱스(+ OpenDartReader import)를 메모리에 올린다
+# - 가장 많이 조회된 종목 N개(STOCKFLOW_WARMUP_TICKERS)의 올해 1월 1일 ~ 어제 주가를 로컬 저장소에서만 공유 캐시로 올린다
+#   (오늘 봉이 없는 닫힌 구간이라 만료되지 않고, 네트워크 수집도 하지 않는다)
+# 롤링 배포 직후 첫 방문자들이 명단 스크래핑/corp_codes 적재/모듈 import 비용을 나눠 내지 않도록 하기 위함
+#
+#   python -m stockflow.warmup            # 서버 시작 전에 디스크 캐시(명단, corp_codes, 주가)를 채우고 단계별 시간 출력
+import argparse
+import datetime
+import importlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+from stockflow import company
+from stockflow import dart
+from stockflow import datasets
+from stockflow import perf
+from stockflow import price_store
+from stockflow.config import DATA_DIR
+from stockflow.storage import write_atomic
+
+POPULAR_PATH = DATA_DIR / "popular.json"
+HEAVY_MODULES = ("FinanceDataReader", "plotly.subplots")
+
+_lock = threading.Lock()
+_started = False
+_requests: Counter | None = None
+
+
+def _load_requests() -> Counter:
+    global _requests
+    if _requests is None:
+        try:
+            _requests = Counter(json.loads(POPULAR_PATH.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            _requests = Counter()
+    return _requests
+
+
+# '조회하기'로 요청된 종목 수를 기록 (예열할 종목 순위에 사용)
+def record_request(stock_code: str) -> None:
+    with _lock:
+        counts = _load_requests()
+        counts[stock_code] += 1
+        text = json.dumps(dict(counts), sort_keys=True)
+        write_atomic(POPULAR_PATH, lambda p: p.write_text(text, encoding="utf-8"))
+
+
+# 많이 조회된 순서로 로컬 저장소에 주가가 있는 종목만
+def popular(n: int) -> list[str]:
+    with _lock:
+        ranked = [code for code, _ in _load_requests().most_common()]
+    return [code for code in ranked if (price_store.PRICE_DIR / f"{code}.parquet").exists()][:n]
+
+
+# 예열할 데이터셋 키: 올해 1월 1일 ~ 어제 (1월 1일에는 예열할 구간이 없어 None)
+def warm_price_key(stock_code: str) -> tuple | None:
+    yesterday = datetime.date.today() - datetime.timedelta(days=1)
+    start = datetime.date(datetime.date.today().year, 1, 1)
+    if yesterday < start:
+        return None
+    return stock_code, start.isoformat(), yesterday.isoformat()
+
+
+def _warm_prices(n_tickers: int) -> None:
+    for code in popular(n_tickers):
+        key = warm_price_key(code)
+        if key is not None and not datasets.preload(key):
+            perf.count("warmup.prices.skip")
+
+
+# 단계 하나가 실패해도 나머지는 계속 (실패한 단계는 첫 방문자가 평소처럼 불러온다)
+def _step(name: str, fn, timings: dict[str, tuple[float, str | None]]) -> None:
+    started = time.perf_counter()
+    error = None
+    try:
+        with perf.span(f"warmup.{name}"):
+            fn()
+    except Exception as e:
+        perf.count(f"warmup.{name}.error")
+        error = str(e)
+    timings[name] = (time.perf_counter() - started, error)
+
+
+# 설정은 호출 시점에 읽는다 (.env를 불러오기 전에 import돼도 반영되도록)
+def enabled() -> bool:
+    return os.getenv("STOCKFLOW_WARMUP", "").lower() in ("1", "true", "on")
+
+
+def top_tickers() -> int:
+    return int(os.getenv("STOCKFLOW_WARMUP_TICKERS", "20"))
+
+
+# 단계 이름 → (소요 시간(초), 오류 메시지 또는 None)
+def run(n_tickers: int | None = None, api_key: str | None = None) -> dict[str, tuple[float, str | None]]:
+    timings: dict[str, tuple[float, str | None]] = {}
+    n_tickers = top_tickers() if n_tickers is None else n_tickers
+    api_key = api_key or os.getenv("DART_API_KEY")
+
+    _step("imports", lambda: [importlib.import_module(m) for m in HEAVY_MODULES], timings)
+    _step("company_index", lambda: (company.load_listing(), company.get_index()), timings)
+    if api_key:
+        # 재무제표 페이지 첫 방문 때 드는 OpenDartReader import도 함께
+        _step("dart_corp_codes", lambda: (dart.get_corp_index(api_key), importlib.import_module("OpenDartReader")), timings)
+    _step("prices", lambda: _warm_prices(n_tickers), timings)
+    return timings
+
+
+# 설정이 켜져 있으면 프로세스당 한 번 백그라운드로 예열 시작 (페이지 스크립트 맨 앞에서 호출)
+def start() -> None:
+    global _started
+    if not enabled():
+        return
+    with _lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=run, name="warmup", daemon=True).start()
+    perf.count("warmup.start")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="StockFlow 캐시 예열")
+    parser.add_argument("--tickers", type=int, default=None, help="예열할 인기 종목 수 (기본: STOCKFLOW_WARMUP_TICKERS)")
+    args = parser.parse_args()
+    for name, (seconds, error) in run(args.tickers).items():
+        print(f"{name:<16}{seconds * 1000:>10.1f} ms" + (f"  실패: {error}" if error else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+# CPU 작업용 프로세스 풀 (스크리너 수집, 백테스트 격자 계산 공용)
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+MAX_PROCESSES = min(8, os.cpu_count() or 1)
+
+
+# Streamlit 서버처럼 스레드가 많은 프로세스에서 fork하면 멈출 수 있으므로 spawn 사용
+# (작업 함수/인자는 모듈 최상위에 정의된 pickle 가능한 것이어야 한다)
+def process_pool(max_workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))